@@ -1,199 +1,349 @@
-# animation_manager.py
-# ============================================================================
-# Animation Management
-# ============================================================================
-
-import time
-import math
-from config import WAVE_COLORS, WAVE_ANIMATION_DELAY, TOTAL_WAVE_BARS
-from color_utils import lighten_color
-
-class AnimationManager:
-    """Manages wave animations only"""
-    
-    def __init__(self, root, audio_engine):
-        self.root = root
-        self.audio_engine = audio_engine
-        self.animation_running = False
-        self.wave_canvas = None
-        self.wave_animation_active = False
-    
-    def start_animations(self):
-        """Start wave animation loop"""
-        self.animation_running = True
-        self.start_wave_animation()
-        print("✅ Animation manager started")
-    
-    def stop_animations(self):
-        """Stop all animations"""
-        self.animation_running = False
-        self.wave_animation_active = False
-        print("⏹️ Animation manager stopped")
-    
-    def set_wave_canvas(self, canvas):
-        """Set the canvas for wave animations"""
-        self.wave_canvas = canvas
-        print("🎨 Wave canvas set for animations")
-    
-    def start_wave_animation(self):
-        """Start the wave animation loop"""
-        if self.animation_running:
-            self.wave_animation_active = True
-            self._draw_wave_frame()
-    
-    def _draw_wave_frame(self):
-        """Draw a single frame of the wave animation"""
-        if not self.wave_animation_active or not self.wave_canvas:
-            return
-        
-        try:
-            self.draw_futuristic_waves()
-            
-            # Schedule next frame
-            if self.animation_running:
-                self.root.after(WAVE_ANIMATION_DELAY, self._draw_wave_frame)
-                
-        except Exception as e:
-            print(f"❌ Wave animation error: {e}")
-            # Continue animation despite errors
-            if self.animation_running:
-                self.root.after(WAVE_ANIMATION_DELAY, self._draw_wave_frame)
-    
-    def draw_futuristic_waves(self):
-        """Draw futuristic audio wave visualization"""
-        if not self.wave_canvas:
-            return
-        
-        canvas = self.wave_canvas
-        canvas.delete("waves")
-        
-        width = canvas.winfo_width()
-        height = canvas.winfo_height()
-        
-        if width <= 1 or height <= 1:
-            return
-        
-        # Get audio levels from engine
-        audio_levels = []
-        if self.audio_engine and hasattr(self.audio_engine, 'get_audio_levels'):
-            try:
-                audio_levels = self.audio_engine.get_audio_levels()
-            except Exception as e:
-                print(f"⚠️ Error getting audio levels: {e}")
-                audio_levels = [0.0] * TOTAL_WAVE_BARS
-        else:
-            audio_levels = [0.0] * TOTAL_WAVE_BARS
-        
-        # Enhanced bar dimensions
-        total_bars = TOTAL_WAVE_BARS
-        bar_width = max(16, (width - 120) // total_bars)
-        spacing = 12
-        start_x = (width - (total_bars * bar_width + (total_bars - 1) * spacing)) // 2
-        max_height = height - 60
-        center_y = height // 2
-        
-        # Check if recording for different visualization modes
-        is_recording = False
-        if self.audio_engine and hasattr(self.audio_engine, 'is_recording'):
-            try:
-                is_recording = self.audio_engine.is_recording
-            except:
-                is_recording = False
-        
-        if is_recording:
-            # Active recording visualization
-            self._draw_active_waves(canvas, audio_levels, total_bars, bar_width, spacing, start_x, max_height, center_y)
-        else:
-            # Idle animation
-            self._draw_idle_waves(canvas, total_bars, bar_width, spacing, start_x, center_y)
-    
-    def _draw_active_waves(self, canvas, audio_levels, total_bars, bar_width, spacing, start_x, max_height, center_y):
-        """Draw active recording wave visualization"""
-        for i in range(total_bars):
-            level = audio_levels[i] if i < len(audio_levels) else 0.0
-            
-            if level > 0.005:
-                bar_height = max(int(level * max_height * 0.8), 8)
-            else:
-                bar_height = 6
-            
-            x = start_x + i * (bar_width + spacing)
-            y_top = center_y - bar_height // 2
-            y_bottom = center_y + bar_height // 2
-            
-            color = WAVE_COLORS[i % len(WAVE_COLORS)]
-            
-            # Glow effect for high levels
-            if level > 0.2:
-                glow_color = lighten_color(color, 0.7)
-                canvas.create_rectangle(
-                    x - 3, y_top - 3, x + bar_width + 3, y_bottom + 3,
-                    fill=glow_color, outline="", tags="waves"
-                )
-            
-            # Main bar
-            canvas.create_rectangle(
-                x, y_top, x + bar_width, y_bottom,
-                fill=color, outline="", tags="waves"
-            )
-            
-            # Inner highlight
-            if bar_height > 12:
-                highlight_color = lighten_color(color, 0.4)
-                canvas.create_rectangle(
-                    x + 3, y_top + 3, x + bar_width - 3, y_top + max(bar_height // 4, 6),
-                    fill=highlight_color, outline="", tags="waves"
-                )
-            
-            # Energy pulse for high levels
-            if level > 0.6:
-                pulse_size = int(level * 8)
-                pulse_color = lighten_color(color, 0.8)
-                canvas.create_oval(
-                    x + bar_width//2 - pulse_size, center_y - pulse_size,
-                    x + bar_width//2 + pulse_size, center_y + pulse_size,
-                    fill="", outline=pulse_color, width=2, tags="waves"
-                )
-    
-    def _draw_idle_waves(self, canvas, total_bars, bar_width, spacing, start_x, center_y):
-        """Draw idle animation waves"""
-        time_factor = time.time() * 2.0
-        
-        for i in range(total_bars):
-            base_height = 8
-            wave_height = base_height + 20 * (math.sin(time_factor + i * 0.7) * 0.5 + 0.5)
-            
-            x = start_x + i * (bar_width + spacing)
-            y_top = center_y - wave_height // 2
-            y_bottom = center_y + wave_height // 2
-            
-            color = WAVE_COLORS[i % len(WAVE_COLORS)]
-            idle_color = lighten_color(color, 0.8)
-            
-            canvas.create_rectangle(
-                x, y_top, x + bar_width, y_bottom,
-                fill=idle_color, outline="", tags="waves"
-            )
-            
-            if wave_height > 15:
-                glow_color = lighten_color(idle_color, 0.5)
-                canvas.create_rectangle(
-                    x - 1, y_top - 1, x + bar_width + 1, y_bottom + 1,
-                    fill="", outline=glow_color, width=1, tags="waves"
-                )
-    
-    def animate_status(self, status_label, message, color):
-        """Simple direct status update"""
-        if not status_label:
-            return
-        
-        # Direct update
-        status_label.config(text=message, fg=color)
-        status_label.update_idletasks()
-        print(f"📊 Simple status update: {message}")
-    
-    def cleanup(self):
-        """Cleanup animation manager"""
-        self.stop_animations()
-        self.wave_canvas = None
-        print("🧹 Animation manager cleaned up")
\ No newline at end of file
+# animation_manager.py
+# ============================================================================
+# Animation Management
+# ============================================================================
+
+import time
+import math
+import logging
+import threading
+from array import array
+from collections import deque
+import numpy as np
+from config import WAVE_COLORS, WAVE_ANIMATION_DELAY, TOTAL_WAVE_BARS
+from color_utils import lighten_palette
+
+log = logging.getLogger(__name__)
+
+# Sine lookup table for idle wave animation (1024 entries, indexed with & mask)
+SIN_LUT_SIZE = 1024
+SIN_LUT_MASK = SIN_LUT_SIZE - 1
+SIN_LUT = array('d', [math.sin(2 * math.pi * k / SIN_LUT_SIZE) for k in range(SIN_LUT_SIZE)])
+SIN_LUT_SCALE = SIN_LUT_SIZE / (2 * math.pi)
+
+def _build_lighten_cache():
+    """Precompute every lightened wave color used by the draw methods"""
+    cache = {}
+    for amount in (0.4, 0.5, 0.7, 0.8):
+        for color, lightened in zip(WAVE_COLORS, lighten_palette(WAVE_COLORS, amount)):
+            cache[(color, amount)] = lightened
+    # Idle glow lightens the already-lightened idle colors
+    idle_colors = [cache[(color, 0.8)] for color in WAVE_COLORS]
+    for idle_color, lightened in zip(idle_colors, lighten_palette(idle_colors, 0.5)):
+        cache[(idle_color, 0.5)] = lightened
+    return cache
+
+LIGHTEN_CACHE = _build_lighten_cache()
+
+# Frame pacing (seconds)
+FRAME_INTERVAL = WAVE_ANIMATION_DELAY / 1000
+FRAME_SKIP_TOLERANCE = 0.050
+ERROR_LOG_INTERVAL = 60.0  # Log repeated animation errors at most once per minute
+
+class AnimationManager:
+    """Manages wave animations only"""
+    
+    def __init__(self, root, audio_engine, debug_mode=False):
+        self.root = root
+        self.audio_engine = audio_engine
+        self.debug_mode = debug_mode
+        
+        # Resolve audio engine accessors once instead of per frame
+        self._get_levels = getattr(audio_engine, 'get_audio_levels', None) if audio_engine else None
+        self._is_recording_fn = lambda e=audio_engine: getattr(e, 'is_recording', False)
+        self.animation_running = False
+        self.wave_canvas = None
+        self.wave_animation_active = False
+        self._bar_items = []
+        self._bar_xs = []
+        self._bar_width = 0
+        self._center_y = 0
+        self._max_height = 0
+        self._next_deadline = 0.0
+        self._last_error_log = 0.0
+        self._zero_levels = array('f', [0.0] * TOTAL_WAVE_BARS)  # Reused when no levels are available
+        self._level_ring = deque(maxlen=2)  # Latest audio level frames (producer: sampler thread)
+        self._level_sampler = None
+        self._sampler_wake = threading.Event()  # Set when the wave animation starts or the manager stops
+        self._bar_colors = [WAVE_COLORS[i % len(WAVE_COLORS)] for i in range(TOTAL_WAVE_BARS)]
+    
+    def start_animations(self):
+        """Start wave animation loop"""
+        self.animation_running = True
+        self.start_level_sampler()
+        self.start_wave_animation()
+        log.info("✅ Animation manager started")
+    
+    def start_level_sampler(self):
+        """Start the background thread that samples audio levels for the Tk draw loop"""
+        if self._level_sampler and self._level_sampler.is_alive():
+            return
+        
+        self._level_sampler = threading.Thread(target=self._sample_audio_levels, daemon=True)
+        self._level_sampler.start()
+    
+    def _sample_audio_levels(self):
+        """Producer loop: poll the audio engine and push level frames into the ring buffer"""
+        get_levels = self._get_levels
+        if get_levels is None:
+            return
+        
+        wake = self._sampler_wake
+        while self.animation_running:
+            if not self.wave_animation_active:
+                # Nothing draws the levels, so park instead of polling the engine every frame
+                wake.clear()
+                if not self.wave_animation_active and self.animation_running:
+                    wake.wait()
+                continue
+            
+            try:
+                self._level_ring.append(get_levels())
+            except Exception as e:
+                self._log_animation_error("⚠️ Error getting audio levels: %s", e)
+            
+            time.sleep(FRAME_INTERVAL)
+    
+    def _log_animation_error(self, message, error):
+        """Log a per-frame error, rate limited so a persistent failure doesn't flood the console"""
+        now = time.monotonic()
+        if now - self._last_error_log >= ERROR_LOG_INTERVAL:
+            self._last_error_log = now
+            log.error(message, error, exc_info=self.debug_mode)
+    
+    def stop_animations(self):
+        """Stop all animations"""
+        self.animation_running = False
+        self.wave_animation_active = False
+        self._sampler_wake.set()  # Let a parked sampler thread exit
+        log.info("⏹️ Animation manager stopped")
+    
+    def set_wave_canvas(self, canvas):
+        """Set the canvas for wave animations"""
+        self.wave_canvas = canvas
+        self._create_bar_items()
+        self._bar_xs = []
+        canvas.bind("<Configure>", self._on_resize)
+        log.debug("🎨 Wave canvas set for animations")
+    
+    def _create_bar_items(self):
+        """Pre-create persistent canvas items for every bar (glow, main, highlight, pulse)"""
+        canvas = self.wave_canvas
+        canvas.delete("waves")
+        self._bar_items = []
+        
+        for _ in range(TOTAL_WAVE_BARS):
+            self._bar_items.append({
+                'glow': canvas.create_rectangle(0, 0, 0, 0, outline="", state='hidden', tags="waves"),
+                'main': canvas.create_rectangle(0, 0, 0, 0, outline="", state='hidden', tags="waves"),
+                'highlight': canvas.create_rectangle(0, 0, 0, 0, outline="", state='hidden', tags="waves"),
+                'pulse': canvas.create_oval(0, 0, 0, 0, fill="", width=2, state='hidden', tags="waves")
+            })
+    
+    def _on_resize(self, event):
+        """Recompute bar geometry when the wave canvas is resized"""
+        width = event.width
+        height = event.height
+        
+        if width <= 1 or height <= 1:
+            self._bar_xs = []
+            return
+        
+        # Enhanced bar dimensions
+        total_bars = TOTAL_WAVE_BARS
+        bar_width = max(16, (width - 120) // total_bars)
+        spacing = 12
+        start_x = (width - (total_bars * bar_width + (total_bars - 1) * spacing)) // 2
+        
+        self._bar_xs = [start_x + i * (bar_width + spacing) for i in range(total_bars)]
+        self._bar_width = bar_width
+        self._max_height = height - 60
+        self._center_y = height // 2
+    
+    def start_wave_animation(self):
+        """Start the wave animation loop"""
+        if self.animation_running:
+            self.wave_animation_active = True
+            self._sampler_wake.set()
+            self._next_deadline = time.monotonic()
+            self._draw_wave_frame()
+    
+    def _draw_wave_frame(self):
+        """Draw a single frame of the wave animation"""
+        if not self.wave_animation_active or not self.wave_canvas:
+            return
+        
+        try:
+            # Skip drawing when running late so the Tk event queue doesn't build a backlog
+            if time.monotonic() <= self._next_deadline + FRAME_SKIP_TOLERANCE:
+                self.draw_futuristic_waves()
+        except Exception as e:
+            self._log_animation_error("❌ Wave animation error: %s", e)
+            # Continue animation despite errors
+        
+        # Schedule next frame
+        if self.animation_running:
+            self._schedule_next_frame()
+    
+    def _schedule_next_frame(self):
+        """Schedule the next frame against a monotonic deadline"""
+        now = time.monotonic()
+        self._next_deadline += FRAME_INTERVAL
+        if self._next_deadline < now:
+            # Fell behind: resynchronize instead of trying to catch up
+            self._next_deadline = now + FRAME_INTERVAL
+        
+        delay = max(1, int((self._next_deadline - now) * 1000))
+        self.root.after(delay, self._draw_wave_frame)
+    
+    def draw_futuristic_waves(self):
+        """Draw futuristic audio wave visualization"""
+        if not self.wave_canvas:
+            return
+        
+        canvas = self.wave_canvas
+        
+        # Bar geometry is computed on <Configure>; nothing to draw until the canvas is laid out
+        if not self._bar_xs:
+            return
+        
+        # Latest audio levels from the sampler thread (never calls into the audio engine here)
+        level_ring = self._level_ring
+        audio_levels = level_ring[-1] if level_ring else self._zero_levels
+        
+        # Check if recording for different visualization modes
+        if self._is_recording_fn():
+            # Active recording visualization
+            self._draw_active_waves(canvas, audio_levels)
+        else:
+            # Idle animation
+            self._draw_idle_waves(canvas)
+        
+        canvas.update_idletasks()
+    
+    def _draw_active_waves(self, canvas, audio_levels):
+        """Draw active recording wave visualization"""
+        bar_xs = self._bar_xs
+        bar_width = self._bar_width
+        center_y = self._center_y
+        
+        # Vectorized per-bar geometry
+        levels = np.zeros(TOTAL_WAVE_BARS, dtype=np.float32)
+        count = min(len(audio_levels), TOTAL_WAVE_BARS)
+        levels[:count] = np.asarray(audio_levels[:count], dtype=np.float32)
+        
+        bar_heights = np.where(levels > 0.005,
+                               np.maximum((levels * self._max_height * 0.8).astype(np.int32), 8),
+                               6)
+        half_heights = bar_heights // 2
+        y_tops = (center_y - half_heights).tolist()
+        y_bottoms = (center_y + half_heights).tolist()
+        glow_mask = (levels > 0.2).tolist()
+        pulse_mask = (levels > 0.6).tolist()
+        pulse_sizes = (levels * 8).astype(np.int32).tolist()
+        bar_heights = bar_heights.tolist()
+        
+        for i in range(TOTAL_WAVE_BARS):
+            items = self._bar_items[i]
+            bar_height = bar_heights[i]
+            x = bar_xs[i]
+            y_top = y_tops[i]
+            y_bottom = y_bottoms[i]
+            
+            color = self._bar_colors[i]
+            
+            # Glow effect for high levels
+            if glow_mask[i]:
+                glow_color = LIGHTEN_CACHE[(color, 0.7)]
+                canvas.coords(items['glow'], x - 3, y_top - 3, x + bar_width + 3, y_bottom + 3)
+                canvas.itemconfigure(items['glow'], fill=glow_color, outline="", state='normal')
+            else:
+                canvas.itemconfigure(items['glow'], state='hidden')
+            
+            # Main bar
+            canvas.coords(items['main'], x, y_top, x + bar_width, y_bottom)
+            canvas.itemconfigure(items['main'], fill=color, state='normal')
+            
+            # Inner highlight
+            if bar_height > 12:
+                highlight_color = LIGHTEN_CACHE[(color, 0.4)]
+                canvas.coords(items['highlight'], x + 3, y_top + 3, x + bar_width - 3, y_top + max(bar_height // 4, 6))
+                canvas.itemconfigure(items['highlight'], fill=highlight_color, state='normal')
+            else:
+                canvas.itemconfigure(items['highlight'], state='hidden')
+            
+            # Energy pulse for high levels
+            if pulse_mask[i]:
+                pulse_size = pulse_sizes[i]
+                pulse_color = LIGHTEN_CACHE[(color, 0.8)]
+                canvas.coords(
+                    items['pulse'],
+                    x + bar_width//2 - pulse_size, center_y - pulse_size,
+                    x + bar_width//2 + pulse_size, center_y + pulse_size
+                )
+                canvas.itemconfigure(items['pulse'], outline=pulse_color, state='normal')
+            else:
+                canvas.itemconfigure(items['pulse'], state='hidden')
+    
+    def _draw_idle_waves(self, canvas):
+        """Draw idle animation waves"""
+        # Bind globals and bound methods to locals for the per-bar loop
+        sin_lut = SIN_LUT
+        lut_mask = SIN_LUT_MASK
+        lighten_cache = LIGHTEN_CACHE
+        coords = canvas.coords
+        itemconfigure = canvas.itemconfigure
+        bar_items = self._bar_items
+        bar_colors = self._bar_colors
+        bar_xs = self._bar_xs
+        bar_width = self._bar_width
+        center_y = self._center_y
+        base_idx = int(time.time() * 2.0 * SIN_LUT_SCALE) & lut_mask
+        step = int(0.7 * SIN_LUT_SCALE)
+        
+        for i in range(TOTAL_WAVE_BARS):
+            base_height = 8
+            s = sin_lut[(base_idx + i * step) & lut_mask]
+            wave_height = base_height + 20 * (s * 0.5 + 0.5)
+            
+            x = bar_xs[i]
+            y_top = center_y - wave_height // 2
+            y_bottom = center_y + wave_height // 2
+            
+            items = bar_items[i]
+            idle_color = lighten_cache[(bar_colors[i], 0.8)]
+            
+            coords(items['main'], x, y_top, x + bar_width, y_bottom)
+            itemconfigure(items['main'], fill=idle_color, state='normal')
+            
+            if wave_height > 15:
+                glow_color = lighten_cache[(idle_color, 0.5)]
+                coords(items['glow'], x - 1, y_top - 1, x + bar_width + 1, y_bottom + 1)
+                itemconfigure(items['glow'], fill="", outline=glow_color, width=1, state='normal')
+            else:
+                itemconfigure(items['glow'], state='hidden')
+            
+            itemconfigure(items['highlight'], state='hidden')
+            itemconfigure(items['pulse'], state='hidden')
+    
+    def animate_status(self, status_label, message, color):
+        """Simple direct status update"""
+        if not status_label:
+            return
+        
+        # Skip no-op updates (compare with the label itself, other code paths also configure it)
+        if status_label.cget('text') == message and status_label.cget('fg') == color:
+            return
+        
+        # Direct update (Tk repaints on the next idle cycle)
+        status_label.config(text=message, fg=color)
+        log.debug("📊 Simple status update: %s", message)
+    
+    def cleanup(self):
+        """Cleanup animation manager"""
+        self.stop_animations()
+        self.wave_canvas = None
+        self._bar_items = []
+        self._bar_xs = []
+        self._level_ring.clear()
+        log.info("🧹 Animation manager cleaned up")
\ No newline at end of file
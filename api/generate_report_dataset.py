@@ -5,6 +5,15 @@ API_KEY = "..."
 OUTPUT_FILENAME = "medreport_text"
 OPENAI_MODEL = "gpt-4o"
 LANGUAGE = "English"
+CONCURRENCY = 8  # Maximum number of API batches generated in parallel
+BATCH_SIZE = 4  # Samples requested per OpenAI call (1 = one report and one transcription call per sample)
+LOG_LEVEL = "INFO"  # Set to "DEBUG" to print every API call and response, "WARNING" for errors only
+MAX_RETRIES = 5  # OpenAI client retries (honours Retry-After on 429)
+HTTP_TIMEOUT = 120  # Seconds per OpenAI request
+MAX_OUTPUT_TOKENS = 16384  # Completion token limit of OPENAI_MODEL; batched calls are capped to it
+CSV_FIELDNAMES = ["input", "output", "language", "sample_id"]
+PARQUET_COMPRESSION = "zstd"
+PARQUET_ROW_GROUP_SIZE = 64  # Samples buffered per Parquet row group when saving incrementally
 
 # Prompt Configuration
 MEDICAL_REPORT_PROMPT = """Generate a realistic, detailed medical report in SOAP format for a random medical consultation. 
@@ -65,15 +74,63 @@ Original medical report:
 
 Generate a realistic, imperfect audio transcription that captures what this consultation would sound like in natural conversation with typical speech-to-text errors."""
 
+# Batched variants: appended to the prompts above to request several samples as one JSON object
+BATCH_REPORT_INSTRUCTIONS = """
+
+Generate {count} different reports, each about a different patient, specialty and condition.
+Return ONLY a JSON object of the form {{"reports": ["<report 1>", "<report 2>", ...]}} with exactly {count} reports."""
+
+BATCH_TRANSCRIPTION_INSTRUCTIONS = """
+
+Convert each of the following {count} medical reports separately.
+Return ONLY a JSON object of the form {{"transcriptions": ["<transcription 1>", "<transcription 2>", ...]}} with exactly {count} transcriptions, in the same order as the reports.
+
+{medical_reports}"""
+
 import openai
+import httpx
+import asyncio
+import csv
 import json
+import logging
+import re
 import time
 from datetime import datetime
 import random
 from typing import List, Dict, Tuple
 import os
+import importlib.util
 from datasets import Dataset
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Parquet schema matching the sample dictionaries
+PARQUET_SCHEMA = pa.schema([
+    ("input", pa.string()),
+    ("output", pa.string()),
+    ("language", pa.string()),
+    ("sample_id", pa.int64()),
+])
+
+log = logging.getLogger(__name__)
+
+# Use orjson for fast serialization when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dump_json_bytes(obj, indent: bool = False) -> bytes:
+    """Serialize an object to UTF-8 JSON bytes (orjson if installed, stdlib json otherwise)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+def load_json(data):
+    """Parse JSON text or bytes (orjson if installed, stdlib json otherwise)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 def get_user_configuration():
     """Get user configuration for dataset generation."""
@@ -107,7 +164,7 @@ def get_user_configuration():
     print(f"   📊 Examples to generate: {num_samples}")
     print(f"   🏁 Starting ID: {start_offset}")
     print(f"   🏁 Ending ID: {start_offset + num_samples - 1}")
-    print(f"   📁 Output file: {OUTPUT_FILENAME}.json/.csv/.jsonl")
+    print(f"   📁 Output file: {OUTPUT_FILENAME}.parquet")
     print(f"   🤖 Model: {OPENAI_MODEL}")
     print(f"   🌍 Language: {LANGUAGE}")
     
@@ -118,26 +175,105 @@ def get_user_configuration():
     
     return num_samples, start_offset
 
+def parse_reset_seconds(value: str) -> float:
+    """Parse OpenAI rate-limit durations such as '1s', '6m0s' or '250ms' into seconds."""
+    if not value:
+        return 0.0
+    
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    
+    units = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(amount) * units[unit] for amount, unit in re.findall(r'([\d.]+)(ms|h|m|s)', value))
+
+def create_http_client(concurrency: int = CONCURRENCY) -> httpx.AsyncClient:
+    """Create a shared keep-alive connection pool sized for the generation concurrency."""
+    # HTTP/2 multiplexing needs the optional h2 package
+    http2 = importlib.util.find_spec("h2") is not None
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency * 2),
+        timeout=HTTP_TIMEOUT
+    )
+
 def format_timestamp():
     """Get formatted timestamp for logging."""
     return datetime.now().strftime("%H:%M:%S")
 
 class MedicalDatasetGenerator:
-    def __init__(self, api_key: str):
-        """Initialize the dataset generator with OpenAI API key."""
-        self.client = openai.OpenAI(api_key=api_key)
+    def __init__(self, api_key: str, http_client: httpx.AsyncClient = None):
+        """Initialize the dataset generator with OpenAI API key and a shared HTTP connection pool."""
+        self.client = openai.AsyncOpenAI(
+            api_key=api_key,
+            max_retries=MAX_RETRIES,
+            http_client=http_client or create_http_client()
+        )
+        self._next_allowed_ts = 0.0
+        self._json_fh = None
+        self._json_first = True
+        self._jsonl_fh = None
+        self._csv_fh = None
+        self._csv_writer = None
+        self._parquet_writer = None
+        self._parquet_rows = []
+
+    async def close(self):
+        """Close the OpenAI client and its connection pool."""
+        await self.client.close()
+
+    async def _wait_for_rate_limit(self):
+        """Wait until the server-informed rate-limit window allows another request."""
+        delay = self._next_allowed_ts - time.monotonic()
+        if delay > 0:
+            log.warning(f"⏳ [{format_timestamp()}] Rate limit reached, waiting {delay:.1f}s...")
+            await asyncio.sleep(delay)
+
+    def _defer_requests(self, seconds: float):
+        """Hold back every pending request for the given number of seconds."""
+        self._next_allowed_ts = max(self._next_allowed_ts, time.monotonic() + seconds)
+
+    async def _create_completion(self, **kwargs):
+        """Create a chat completion, pacing requests from the rate-limit response headers."""
+        await self._wait_for_rate_limit()
+        
+        try:
+            raw_response = await self.client.chat.completions.with_raw_response.create(**kwargs)
+        except openai.RateLimitError as e:
+            # Client retries are exhausted; pause all samples for the server-requested time
+            self._defer_requests(parse_reset_seconds(e.response.headers.get("retry-after", "")))
+            raise
+        
+        remaining = raw_response.headers.get("x-ratelimit-remaining-requests")
+        if remaining is not None and remaining.isdigit() and int(remaining) == 0:
+            self._defer_requests(parse_reset_seconds(raw_response.headers.get("x-ratelimit-reset-requests", "")))
+        
+        return raw_response.parse()
+
+    async def _stream_completion(self, **kwargs) -> str:
+        """Stream a chat completion and accumulate the content deltas as they arrive."""
+        stream = await self._create_completion(stream=True, **kwargs)
+        
+        parts = []
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+        
+        return "".join(parts)
 
-    def generate_medical_report(self, language: str = "English", sample_num: int = 0) -> str:
+    async def generate_medical_report(self, language: str = "English", sample_num: int = 0) -> str:
         """Generate a high-quality SOAP medical report."""
         
         try:
             start_time = time.time()
             timestamp = format_timestamp()
-            print(f"🔄 [{timestamp}] API Call 1 (Sample {sample_num}): Generating medical report...")
-            print(f"   Model: {OPENAI_MODEL}")
-            print(f"   Language: {language}")
+            log.debug(f"🔄 [{timestamp}] API Call 1 (Sample {sample_num}): Generating medical report...")
+            log.debug(f"   Model: {OPENAI_MODEL}")
+            log.debug(f"   Language: {language}")
             
-            response = self.client.chat.completions.create(
+            # Stream the report so the transcription call can start as soon as the last token arrives
+            content = await self._stream_completion(
                 model=OPENAI_MODEL,
                 messages=[
                     {"role": "system", "content": "You are an experienced physician writing medical reports. Generate realistic, professional SOAP notes."},
@@ -149,38 +285,34 @@ class MedicalDatasetGenerator:
             
             end_time = time.time()
             duration = end_time - start_time
-            result = response.choices[0].message.content.strip()
+            result = content.strip()
             timestamp_end = format_timestamp()
             
-            print(f"✅ [{timestamp_end}] API Call 1 (Sample {sample_num}) completed - Generated {len(result)} characters in {duration:.2f}s")
-            print(f"📄 OpenAI Response 1 (Sample {sample_num}):")
-            print("-" * 50)
+            log.debug(f"✅ [{timestamp_end}] API Call 1 (Sample {sample_num}) completed - Generated {len(result)} characters in {duration:.2f}s")
+            
+            if log.isEnabledFor(logging.DEBUG):
+                # Truncate if too long
+                preview = result[:800] + "..." if len(result) > 800 else result
+                log.debug(f"📄 OpenAI Response 1 (Sample {sample_num}):\n{'-' * 50}\n{preview}\n{'-' * 50}")
             
-            # Truncate if too long
-            if len(result) > 800:
-                print(result[:800] + "...")
-            else:
-                print(result)
-                
-            print("-" * 50)
             return result
             
         except Exception as e:
             timestamp_error = format_timestamp()
-            print(f"❌ [{timestamp_error}] API Call 1 (Sample {sample_num}) failed: {e}")
+            log.error(f"❌ [{timestamp_error}] API Call 1 (Sample {sample_num}) failed: {e}")
             return None
 
-    def create_realistic_transcription(self, medical_report: str, sample_num: int = 0) -> str:
+    async def create_realistic_transcription(self, medical_report: str, sample_num: int = 0) -> str:
         """Convert a medical report into a realistic, low-quality audio transcription with errors."""
 
         try:
             start_time = time.time()
             timestamp = format_timestamp()
-            print(f"🔄 [{timestamp}] API Call 2 (Sample {sample_num}): Creating realistic transcription with errors...")
-            print(f"   Model: {OPENAI_MODEL}")
-            print(f"   Input length: {len(medical_report)} characters")
+            log.debug(f"🔄 [{timestamp}] API Call 2 (Sample {sample_num}): Creating realistic transcription with errors...")
+            log.debug(f"   Model: {OPENAI_MODEL}")
+            log.debug(f"   Input length: {len(medical_report)} characters")
             
-            response = self.client.chat.completions.create(
+            response = await self._create_completion(
                 model=OPENAI_MODEL,
                 messages=[
                     {"role": "system", "content": "You convert formal medical reports into realistic, imperfect audio transcriptions of natural doctor-patient conversations with speech-to-text errors."},
@@ -195,165 +327,343 @@ class MedicalDatasetGenerator:
             result = response.choices[0].message.content.strip()
             timestamp_end = format_timestamp()
             
-            print(f"✅ [{timestamp_end}] API Call 2 (Sample {sample_num}) completed - Generated {len(result)} characters in {duration:.2f}s")
-            print(f"📄 OpenAI Response 2 (Sample {sample_num}):")
-            print("-" * 50)
+            log.debug(f"✅ [{timestamp_end}] API Call 2 (Sample {sample_num}) completed - Generated {len(result)} characters in {duration:.2f}s")
+            
+            if log.isEnabledFor(logging.DEBUG):
+                # Truncate if too long
+                preview = result[:800] + "..." if len(result) > 800 else result
+                log.debug(f"📄 OpenAI Response 2 (Sample {sample_num}):\n{'-' * 50}\n{preview}\n{'-' * 50}")
             
-            # Truncate if too long
-            if len(result) > 800:
-                print(result[:800] + "...")
-            else:
-                print(result)
-                
-            print("-" * 50)
             return result
             
         except Exception as e:
             timestamp_error = format_timestamp()
-            print(f"❌ [{timestamp_error}] API Call 2 (Sample {sample_num}) failed: {e}")
+            log.error(f"❌ [{timestamp_error}] API Call 2 (Sample {sample_num}) failed: {e}")
             return None
 
-    def generate_training_pair(self, language: str = "English", sample_num: int = 0) -> Tuple[str, str]:
+    async def generate_training_pair(self, language: str = "English", sample_num: int = 0) -> Tuple[str, str]:
         """Generate a single training pair (transcription, report)."""
         
         timestamp = format_timestamp()
-        print(f"\n📋 [{timestamp}] Generating training pair {sample_num} in {language}...")
-        print("=" * 60)
+        log.debug(f"📋 [{timestamp}] Generating training pair {sample_num} in {language}...")
+        log.debug("=" * 60)
         
         # Generate high-quality medical report
-        report = self.generate_medical_report(language, sample_num)
+        report = await self.generate_medical_report(language, sample_num)
         if not report:
-            print(f"❌ Failed to generate medical report for sample {sample_num}")
+            log.error(f"❌ Failed to generate medical report for sample {sample_num}")
             return None, None
             
         # Create realistic transcription with errors in one step
-        transcription = self.create_realistic_transcription(report, sample_num)
+        transcription = await self.create_realistic_transcription(report, sample_num)
         if not transcription:
-            print(f"❌ Failed to generate transcription for sample {sample_num}")
+            log.error(f"❌ Failed to generate transcription for sample {sample_num}")
             return None, None
         
         timestamp_end = format_timestamp()
-        print(f"✅ [{timestamp_end}] Training pair {sample_num} generated successfully!")
-        print("=" * 60)
+        log.debug(f"✅ [{timestamp_end}] Training pair {sample_num} generated successfully!")
+        log.debug("=" * 60)
         
         return transcription, report
 
+    async def generate_medical_reports(self, count: int, language: str = "English", sample_num: int = 0) -> List[str]:
+        """Generate several SOAP medical reports in a single JSON-structured API call."""
+        
+        try:
+            start_time = time.time()
+            timestamp = format_timestamp()
+            log.debug(f"🔄 [{timestamp}] API Call 1 (Samples {sample_num}-{sample_num + count - 1}): Generating {count} medical reports...")
+            
+            content = await self._stream_completion(
+                model=OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": "You are an experienced physician writing medical reports. Generate realistic, professional SOAP notes."},
+                    {"role": "user", "content": MEDICAL_REPORT_PROMPT.format(language=language) + BATCH_REPORT_INSTRUCTIONS.format(count=count)}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.8,
+                max_tokens=min(1500 * count, MAX_OUTPUT_TOKENS)
+            )
+            
+            reports = [report.strip() for report in load_json(content)["reports"] if report and report.strip()]
+            duration = time.time() - start_time
+            log.debug(f"✅ [{format_timestamp()}] API Call 1 (Samples {sample_num}-{sample_num + count - 1}) completed - Generated {len(reports)} reports in {duration:.2f}s")
+            
+            return reports[:count]
+            
+        except Exception as e:
+            log.error(f"❌ [{format_timestamp()}] API Call 1 (Samples {sample_num}-{sample_num + count - 1}) failed: {e}")
+            return []
+
+    async def create_realistic_transcriptions(self, medical_reports: List[str], sample_num: int = 0) -> List[str]:
+        """Convert several medical reports into realistic transcriptions in a single JSON-structured API call."""
+        
+        count = len(medical_reports)
+        try:
+            start_time = time.time()
+            timestamp = format_timestamp()
+            log.debug(f"🔄 [{timestamp}] API Call 2 (Samples {sample_num}-{sample_num + count - 1}): Creating {count} realistic transcriptions...")
+            
+            # The shared instructions are sent once for the whole batch instead of once per report
+            bundled_reports = "\n\n".join(f"Report {i + 1}:\n{report}" for i, report in enumerate(medical_reports))
+            prompt = TRANSCRIPTION_PROMPT.split("Original medical report:")[0] + BATCH_TRANSCRIPTION_INSTRUCTIONS.format(
+                count=count, medical_reports=bundled_reports)
+            
+            response = await self._create_completion(
+                model=OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": "You convert formal medical reports into realistic, imperfect audio transcriptions of natural doctor-patient conversations with speech-to-text errors."},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.9,
+                max_tokens=min(2000 * count, MAX_OUTPUT_TOKENS)
+            )
+            
+            transcriptions = [(transcription or "").strip() for transcription in load_json(response.choices[0].message.content)["transcriptions"]]
+            duration = time.time() - start_time
+            log.debug(f"✅ [{format_timestamp()}] API Call 2 (Samples {sample_num}-{sample_num + count - 1}) completed - Generated {len(transcriptions)} transcriptions in {duration:.2f}s")
+            
+            return transcriptions
+            
+        except Exception as e:
+            log.error(f"❌ [{format_timestamp()}] API Call 2 (Samples {sample_num}-{sample_num + count - 1}) failed: {e}")
+            return []
+
+    async def generate_training_batch(self, count: int, language: str = "English", sample_num: int = 0) -> List[Tuple[str, str]]:
+        """Generate up to `count` training pairs (transcription, report) with two API calls."""
+        
+        if count == 1:
+            transcription, report = await self.generate_training_pair(language, sample_num)
+            return [(transcription, report)] if transcription and report else []
+        
+        reports = await self.generate_medical_reports(count, language, sample_num)
+        if len(reports) < count:
+            log.warning(f"⚠️ Got {len(reports)} of {count} medical reports (samples {sample_num}-{sample_num + count - 1}), generating the rest one by one")
+        
+        transcriptions = await self.create_realistic_transcriptions(reports, sample_num) if reports else []
+        if len(transcriptions) != len(reports):
+            # Without a one-to-one answer the transcriptions can't be matched to their reports
+            log.warning(f"⚠️ Got {len(transcriptions)} transcriptions for {len(reports)} reports (samples {sample_num}-{sample_num + count - 1}), converting them one by one")
+            transcriptions = [""] * len(reports)
+        
+        # Retry only the missing items with the single-sample calls instead of dropping the batch
+        async def complete(index: int):
+            if index >= len(reports):
+                return await self.generate_training_pair(language, sample_num + index)
+            if transcriptions[index]:
+                return transcriptions[index], reports[index]
+            return await self.create_realistic_transcription(reports[index], sample_num + index), reports[index]
+        
+        pairs = await asyncio.gather(*(complete(index) for index in range(count)))
+        return [(transcription, report) for transcription, report in pairs if transcription and report]
+
     def save_dataset_locally(self, dataset_samples: List[Dict], output_formats: List[str] = ["json"], sample_num: int = 0):
         """Save dataset in multiple local formats."""
         
-        print(f"💾 Saving {len(dataset_samples)} samples locally (up to sample {sample_num})...")
+        log.debug(f"💾 Saving {len(dataset_samples)} samples locally (up to sample {sample_num})...")
         
         try:
             if "json" in output_formats:
-                with open(f"{OUTPUT_FILENAME}.json", 'w', encoding='utf-8') as f:
-                    json.dump(dataset_samples, f, indent=2, ensure_ascii=False)
-                print(f"✓ Saved as JSON: {OUTPUT_FILENAME}.json (Sample {sample_num})")
+                with open(f"{OUTPUT_FILENAME}.json", 'wb') as f:
+                    f.write(dump_json_bytes(dataset_samples, indent=True))
+                log.debug(f"✓ Saved as JSON: {OUTPUT_FILENAME}.json (Sample {sample_num})")
             
             if "csv" in output_formats:
-                df = pd.DataFrame(dataset_samples)
-                df.to_csv(f"{OUTPUT_FILENAME}.csv", index=False, encoding='utf-8')
-                print(f"✓ Saved as CSV: {OUTPUT_FILENAME}.csv (Sample {sample_num})")
+                with open(f"{OUTPUT_FILENAME}.csv", 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.DictWriter(f, fieldnames=CSV_FIELDNAMES)
+                    writer.writeheader()
+                    writer.writerows(dataset_samples)
+                log.debug(f"✓ Saved as CSV: {OUTPUT_FILENAME}.csv (Sample {sample_num})")
             
             if "jsonl" in output_formats:
-                with open(f"{OUTPUT_FILENAME}.jsonl", 'w', encoding='utf-8') as f:
+                with open(f"{OUTPUT_FILENAME}.jsonl", 'wb') as f:
                     for sample in dataset_samples:
-                        f.write(json.dumps(sample, ensure_ascii=False) + '\n')
-                print(f"✓ Saved as JSONL: {OUTPUT_FILENAME}.jsonl (Sample {sample_num})")
+                        f.write(dump_json_bytes(sample) + b'\n')
+                log.debug(f"✓ Saved as JSONL: {OUTPUT_FILENAME}.jsonl (Sample {sample_num})")
+            
+            if "parquet" in output_formats:
+                table = pa.Table.from_pylist(dataset_samples, schema=PARQUET_SCHEMA)
+                pq.write_table(table, f"{OUTPUT_FILENAME}.parquet", compression=PARQUET_COMPRESSION)
+                log.debug(f"✓ Saved as Parquet: {OUTPUT_FILENAME}.parquet (Sample {sample_num})")
                 
         except Exception as e:
-            print(f"❌ Error saving files (Sample {sample_num}): {e}")
+            log.error(f"❌ Error saving files (Sample {sample_num}): {e}")
+
+    def append_sample_locally(self, sample: Dict):
+        """Append a single sample to the open incremental output files."""
+        
+        try:
+            if self._json_fh:
+                if not self._json_first:
+                    self._json_fh.write(b",\n")
+                self._json_fh.write(dump_json_bytes(sample, indent=True))
+                self._json_fh.flush()
+                self._json_first = False
+            
+            if self._jsonl_fh:
+                self._jsonl_fh.write(dump_json_bytes(sample) + b'\n')
+                self._jsonl_fh.flush()
+            
+            if self._csv_writer:
+                self._csv_writer.writerow(sample)
+                self._csv_fh.flush()
+            
+            if self._parquet_writer:
+                # One row group per sample bloats the footer and kills compression, so rows are written in groups
+                self._parquet_rows.append(sample)
+                if len(self._parquet_rows) >= PARQUET_ROW_GROUP_SIZE:
+                    self.flush_parquet_rows()
+        except Exception as e:
+            log.error(f"❌ Error appending sample {sample['sample_id']}: {e}")
 
-    def generate_dataset(self, num_samples: int, start_id: int = 1, language: str = "English", 
-                        save_formats: List[str] = ["json", "csv"], 
-                        batch_size: int = 10, 
+    def flush_parquet_rows(self):
+        """Write the buffered samples to the incremental Parquet file as one row group."""
+        
+        if self._parquet_writer and self._parquet_rows:
+            rows, self._parquet_rows = self._parquet_rows, []
+            self._parquet_writer.write_table(pa.Table.from_pylist(rows, schema=PARQUET_SCHEMA))
+
+    def close_incremental_files(self):
+        """Close any output files opened for incremental saving."""
+        
+        if self._json_fh:
+            self._json_fh.write(b"\n]\n")
+            self._json_fh.close()
+            self._json_fh = None
+        
+        if self._jsonl_fh:
+            self._jsonl_fh.close()
+            self._jsonl_fh = None
+        
+        if self._csv_fh:
+            self._csv_fh.close()
+            self._csv_fh = None
+            self._csv_writer = None
+        
+        if self._parquet_writer:
+            try:
+                self.flush_parquet_rows()
+            finally:
+                self._parquet_writer.close()
+                self._parquet_writer = None
+                self._parquet_rows = []
+
+    async def generate_dataset(self, num_samples: int, start_id: int = 1, language: str = "English", 
+                        save_formats: List[str] = ["parquet"], 
+                        concurrency: int = CONCURRENCY, 
+                        batch_size: int = BATCH_SIZE,
                         save_incrementally: bool = True) -> Dataset:
         """Generate a complete dataset with the specified number of samples."""
         
         script_start_time = time.time()
         timestamp = format_timestamp()
         
-        print(f"\n🚀 [{timestamp}] Starting dataset generation...")
-        print(f"Generating {num_samples} medical transcription-report pairs...")
-        print(f"Starting from ID: {start_id}")
-        print(f"Save mode: {'Incremental (after each sample)' if save_incrementally else 'Batch (at the end)'}")
+        log.info(f"🚀 [{timestamp}] Starting dataset generation...")
+        log.info(f"Generating {num_samples} medical transcription-report pairs...")
+        log.info(f"Starting from ID: {start_id}")
+        log.info(f"Concurrency: {concurrency} batches of up to {batch_size} samples in parallel")
+        log.info(f"Save mode: {'Incremental (after each sample)' if save_incrementally else 'Batch (at the end)'}")
         
         dataset_samples = []
         successful_generations = 0
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        # Incremental mode streams one row per sample to every output file; batch mode writes them once at the end
+        final_formats = save_formats
+        if save_incrementally:
+            if "json" in save_formats:
+                self._json_fh = open(f"{OUTPUT_FILENAME}.json", 'wb')
+                self._json_fh.write(b"[\n")
+                self._json_first = True
+            if "jsonl" in save_formats:
+                self._jsonl_fh = open(f"{OUTPUT_FILENAME}.jsonl", 'wb')
+            if "csv" in save_formats:
+                self._csv_fh = open(f"{OUTPUT_FILENAME}.csv", 'w', newline='', encoding='utf-8')
+                self._csv_writer = csv.DictWriter(self._csv_fh, fieldnames=CSV_FIELDNAMES)
+                self._csv_writer.writeheader()
+            if "parquet" in save_formats:
+                self._parquet_writer = pq.ParquetWriter(f"{OUTPUT_FILENAME}.parquet", schema=PARQUET_SCHEMA,
+                                                        compression=PARQUET_COMPRESSION)
+            final_formats = []
         
-        for i in range(0, num_samples, batch_size):
-            batch_end = min(i + batch_size, num_samples)
-            batch_timestamp = format_timestamp()
-            print(f"\n[{batch_timestamp}] Generating batch {i//batch_size + 1}/{(num_samples-1)//batch_size + 1} (samples {start_id + i}-{start_id + batch_end - 1})")
+        async def generate_batch(j, count):
+            nonlocal successful_generations
+            first_sample_id = start_id + j
             
-            for j in range(i, batch_end):
-                actual_sample_id = start_id + j
+            async with semaphore:
                 try:
-                    transcription, report = self.generate_training_pair(language, actual_sample_id)
-                    
-                    if transcription and report:
-                        sample = {
-                            "input": transcription,
-                            "output": report,
-                            "language": language,
-                            "sample_id": actual_sample_id
-                        }
-                        dataset_samples.append(sample)
-                        successful_generations += 1
-                        success_timestamp = format_timestamp()
-                        print(f"✓ [{success_timestamp}] Generated sample {actual_sample_id} ({j + 1}/{num_samples})")
-                        
-                        # Save incrementally if enabled
-                        if save_incrementally:
-                            self.save_dataset_locally(dataset_samples, save_formats, actual_sample_id)
-                            save_timestamp = format_timestamp()
-                            print(f"💾 [{save_timestamp}] Saved {len(dataset_samples)} samples so far (Sample {actual_sample_id})")
-                        
-                    else:
-                        error_timestamp = format_timestamp()
-                        print(f"✗ [{error_timestamp}] Failed to generate sample {actual_sample_id}")
-                        
+                    pairs = await self.generate_training_batch(count, language, first_sample_id)
                 except Exception as e:
                     error_timestamp = format_timestamp()
-                    print(f"✗ [{error_timestamp}] Error generating sample {actual_sample_id}: {e}")
-                
-                # Add delay to respect API rate limits
-                time.sleep(1)
+                    log.error(f"✗ [{error_timestamp}] Error generating samples {first_sample_id}-{first_sample_id + count - 1}: {e}")
+                    return
             
-            # Longer delay between batches
-            if batch_end < num_samples:
-                delay_timestamp = format_timestamp()
-                print(f"[{delay_timestamp}] Waiting 10 seconds before next batch...")
-                time.sleep(10)
+            if len(pairs) < count:
+                error_timestamp = format_timestamp()
+                log.error(f"✗ [{error_timestamp}] Failed to generate {count - len(pairs)} of samples {first_sample_id}-{first_sample_id + count - 1}")
+            
+            for offset, (transcription, report) in enumerate(pairs):
+                actual_sample_id = first_sample_id + offset
+                sample = {
+                    "input": transcription,
+                    "output": report,
+                    "language": language,
+                    "sample_id": actual_sample_id
+                }
+                dataset_samples.append(sample)
+                successful_generations += 1
+                success_timestamp = format_timestamp()
+                log.info(f"✓ [{success_timestamp}] Generated sample {actual_sample_id} ({successful_generations}/{num_samples})")
+                
+                # Save incrementally if enabled
+                if save_incrementally:
+                    self.append_sample_locally(sample)
+                    save_timestamp = format_timestamp()
+                    log.debug(f"💾 [{save_timestamp}] Saved {len(dataset_samples)} samples so far (Sample {actual_sample_id})")
+        
+        # Rate limits are handled by the semaphore and the OpenAI client's built-in retries
+        batch_size = max(1, batch_size)
+        try:
+            await asyncio.gather(*[generate_batch(j, min(batch_size, num_samples - j))
+                                   for j in range(0, num_samples, batch_size)])
+        finally:
+            self.close_incremental_files()
+        
+        # Samples complete out of order; keep the dataset sorted by ID
+        dataset_samples.sort(key=lambda sample: sample["sample_id"])
         
         script_end_time = time.time()
         total_duration = script_end_time - script_start_time
         final_timestamp = format_timestamp()
         
-        print(f"\n[{final_timestamp}] Successfully generated {successful_generations}/{num_samples} samples")
-        print(f"⏱️  Total generation time: {total_duration:.2f} seconds ({total_duration/60:.2f} minutes)")
+        log.info(f"[{final_timestamp}] Successfully generated {successful_generations}/{num_samples} samples")
+        log.info(f"⏱️  Total generation time: {total_duration:.2f} seconds ({total_duration/60:.2f} minutes)")
         if successful_generations > 0:
             avg_time_per_sample = total_duration / successful_generations
-            print(f"⏱️  Average time per sample: {avg_time_per_sample:.2f} seconds")
+            log.info(f"⏱️  Average time per sample: {avg_time_per_sample:.2f} seconds")
         
-        # Final save (in case incremental was disabled or as backup)
+        # Final save of the formats that were not streamed during generation
         if dataset_samples:  # Only save if we have data
-            if not save_incrementally:
-                print(f"\nFinal save: Saving dataset locally...")
-                self.save_dataset_locally(dataset_samples, save_formats, successful_generations)
-            else:
-                print(f"\n💾 Final backup save completed (Total: {successful_generations} samples)")
+            if final_formats:
+                log.info(f"Final save: Saving dataset locally...")
+                self.save_dataset_locally(dataset_samples, final_formats, successful_generations)
+            log.info(f"💾 Final save completed (Total: {successful_generations} samples)")
         else:
-            print("No data to save!")
+            log.warning("No data to save!")
             return None
         
-        # Create HuggingFace Dataset
-        df = pd.DataFrame(dataset_samples)
-        dataset = Dataset.from_pandas(df)
+        # Create HuggingFace Dataset (read back from Parquet when available to skip pandas)
+        if "parquet" in save_formats:
+            # Incremental Parquet rows are in completion order, so sort the read-back too
+            dataset = Dataset.from_parquet(f"{OUTPUT_FILENAME}.parquet").sort("sample_id")
+        else:
+            dataset = Dataset.from_list(dataset_samples)
         
         return dataset
 
-    def test_file_creation(self):
-        """Test function to verify file creation works."""
+    def test_file_creation(self, formats: List[str] = ["parquet"]):
+        """Test function to verify file creation works for the given formats."""
         test_data = [
             {
                 "input": "So tell me what's been bothering you... um... Well doctor I've been having chest pain...",
@@ -364,19 +674,22 @@ class MedicalDatasetGenerator:
         ]
         
         print("Testing file creation...")
-        self.save_dataset_locally(test_data, ["json", "csv", "jsonl"])
+        self.save_dataset_locally(test_data, formats)
         
-        # Check if files were created
+        # Check if files were created, then remove them so no one-row test file is left behind
         import os
-        files_to_check = [f"{OUTPUT_FILENAME}.json", f"{OUTPUT_FILENAME}.csv", f"{OUTPUT_FILENAME}.jsonl"]
+        files_to_check = [f"{OUTPUT_FILENAME}.{fmt}" for fmt in formats]
         for file in files_to_check:
             if os.path.exists(file):
                 print(f"✓ {file} created successfully")
+                os.remove(file)
             else:
                 print(f"✗ {file} was NOT created")
 
 # Example usage
 def main():
+    logging.basicConfig(level=LOG_LEVEL, format="%(message)s")
+    
     # Initialize generator with API key from top of file
     generator = MedicalDatasetGenerator(API_KEY)
     
@@ -386,10 +699,11 @@ def main():
         return
     
     num_samples, start_id = config
+    save_formats = ["parquet"]  # Choose formats: parquet, json, csv, jsonl
     
     # Test file creation first
     print("\n=== Testing File Creation ===")
-    generator.test_file_creation()
+    generator.test_file_creation(save_formats)
     print("\n" + "="*50 + "\n")
     
     # Generate dataset directly without asking
@@ -398,13 +712,19 @@ def main():
     # Generate dataset with local saving options
     language = LANGUAGE
     
-    dataset = generator.generate_dataset(
-        num_samples=num_samples,
-        start_id=start_id,
-        language=language,
-        save_formats=["json", "csv", "jsonl"],  # Choose formats: json, csv, jsonl
-        save_incrementally=True  # Set to False to save only at the end
-    )
+    async def run_generation():
+        try:
+            return await generator.generate_dataset(
+                num_samples=num_samples,
+                start_id=start_id,
+                language=language,
+                save_formats=save_formats,
+                save_incrementally=True  # Set to False to save only at the end
+            )
+        finally:
+            await generator.close()
+    
+    dataset = asyncio.run(run_generation())
     
     # Print sample
     if dataset and len(dataset) > 0:
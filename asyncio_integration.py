@@ -0,0 +1,109 @@
+# asyncio_integration.py
+# ============================================================================
+# Tk / asyncio Bridge - runs an asyncio event loop from the Tk main loop
+# ============================================================================
+
+import asyncio
+import math
+
+class _TkPumpedLoop(asyncio.SelectorEventLoop):
+    """Event loop that asks Tk for a pump only when it has work due
+    
+    Scheduling a callback arms a single root.after for the earliest deadline;
+    with no ready callbacks and no timers nothing is scheduled, so an idle loop
+    costs the Tk main loop nothing.
+    """
+    
+    def __init__(self, root):
+        super().__init__()
+        self._root = root
+        self._pump_id = None
+        self._pump_due = None
+        self._pumping = False
+    
+    def call_soon(self, callback, *args, context=None):
+        handle = super().call_soon(callback, *args, context=context)
+        self._arm_pump()
+        return handle
+    
+    def call_at(self, when, callback, *args, context=None):
+        # call_later goes through call_at
+        handle = super().call_at(when, callback, *args, context=context)
+        self._arm_pump()
+        return handle
+    
+    def close(self):
+        self._cancel_pump()
+        super().close()
+    
+    def _next_deadline(self):
+        """Loop time of the earliest pending work, or None when idle"""
+        if self._ready:
+            return self.time()
+        if self._scheduled:
+            return self._scheduled[0].when()
+        return None
+    
+    def _arm_pump(self):
+        """Schedule a pump for the next deadline unless an earlier one is already armed"""
+        if self._pumping or self.is_closed():
+            # The running pump re-arms itself once it returns
+            return
+        
+        due = self._next_deadline()
+        if due is None:
+            return
+        if self._pump_id is not None:
+            if self._pump_due <= due:
+                return
+            self._cancel_pump()
+        
+        delay = max(0, math.ceil((due - self.time()) * 1000))
+        self._pump_due = due
+        self._pump_id = self._root.after(delay, self._pump)
+    
+    def _cancel_pump(self):
+        if self._pump_id is not None:
+            try:
+                self._root.after_cancel(self._pump_id)
+            except Exception:
+                pass
+            self._pump_id = None
+            self._pump_due = None
+    
+    def _pump(self):
+        """Run every callback that is due, then hand control back to Tk"""
+        self._pump_id = None
+        self._pump_due = None
+        if self.is_closed():
+            return
+        
+        self._pumping = True
+        try:
+            super().call_soon(self.stop)
+            self.run_forever()
+        finally:
+            self._pumping = False
+        self._arm_pump()
+
+def schedule_asyncio(root):
+    """Create an event loop pumped from the Tk main loop
+    
+    Coroutines scheduled on the returned loop run on the Tk thread, so they may
+    touch widgets directly. The loop is only pumped when a callback or timer is
+    due, e.g. once per chronometer tick while recording and never while idle.
+    """
+    return _TkPumpedLoop(root)
+
+def stop_asyncio(loop):
+    """Cancel pending tasks and close a loop created by schedule_asyncio"""
+    if loop is None or loop.is_closed():
+        return
+    
+    for task in asyncio.all_tasks(loop):
+        task.cancel()
+    
+    # Let cancelled tasks unwind before closing
+    loop.call_soon(loop.stop)
+    loop.run_forever()
+    loop.close()
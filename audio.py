@@ -13,17 +13,44 @@ import asyncio
 from config import *
 from audio_chunks_manager import AudioChunksManager
 from local_model_manager import LocalModelManager
+from audio_kernels import NUMBA_AVAILABLE, update_levels, warm_up_kernels
+
+# rtmixer records into a ring buffer from a C callback, keeping Python off the audio thread
+try:
+    import rtmixer
+except ImportError:
+    rtmixer = None
+
+# Ring buffer capacity in frames (power of two, ~2 seconds of audio)
+RINGBUFFER_FRAMES = 1 << (2 * SAMPLE_RATE - 1).bit_length()
+
+# Marks that the processing worker has no task held back from a batch
+_NO_TASK = object()
+
+# Typical upper bound of frames per audio block (scratch buffers grow if exceeded)
+MAX_FRAMES_PER_BUFFER = 4096
 
 class AudioEngine:
+    # Fixed attribute layout: faster attribute access on the audio hot path and no per-instance __dict__
+    __slots__ = (
+        'ui_callbacks', 'is_recording', 'audio_buffer', 'write_pos', 'last_sent_time', 'recording_start_time',
+        'chunks_sent', 'audio_levels', '_bar_phase', '_mono_scratch', 'sender_thread', 'last_sent_sample_count',
+        'chunk_transcripts', '_joined_transcript', 'processing_queue', 'chunks_manager',
+        'model_manager', '_loop', 'stream', '_record_action', '_reader_thread', '_ringbuffer', '_read_block',
+        'processing_worker',
+    )
+    
     def __init__(self, ui_callbacks):
         self.ui_callbacks = ui_callbacks
         self.is_recording = False
-        self.audio_buffer = np.empty((0, CHANNELS), dtype='int16')
-        self.lock = threading.Lock()
+        self.audio_buffer = np.empty((AUDIO_BUFFER_SECONDS * SAMPLE_RATE, CHANNELS), dtype='int16')
+        self.write_pos = 0  # Published by the audio writer only after the frames are in place
         self.last_sent_time = 0
         self.recording_start_time = 0
         self.chunks_sent = 0
-        self.audio_levels = [0.0] * TOTAL_WAVE_BARS
+        self.audio_levels = np.zeros(TOTAL_WAVE_BARS, dtype=np.float32)
+        self._bar_phase = np.arange(TOTAL_WAVE_BARS, dtype=np.float32) * 1.2
+        self._mono_scratch = np.empty(MAX_FRAMES_PER_BUFFER, dtype=np.int64)  # Reused channel-sum buffer for RMS
         self.sender_thread = None
         
         # Chunking tracking
@@ -31,9 +58,10 @@ class AudioEngine:
         
         # Transcript management
         self.chunk_transcripts = []
+        self._joined_transcript = None  # Cached " ".join of chunk_transcripts, rebuilt after each new chunk
         
         # Processing queue for local models
-        self.processing_queue = queue.Queue()
+        self.processing_queue = queue.SimpleQueue()
         
         # Initialize audio chunks manager
         self.chunks_manager = AudioChunksManager()
@@ -47,16 +75,27 @@ class AudioEngine:
         }
         self.model_manager = LocalModelManager(model_ui_callbacks)
         
+        # Persistent event loop for model coroutines (reused by every chunk)
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        
         # Start loading models in background
         threading.Thread(target=self._load_models_background, daemon=True).start()
         
         # Setup audio stream
-        self.stream = sd.InputStream(
-            samplerate=SAMPLE_RATE,
-            channels=CHANNELS,
-            dtype='int16',
-            callback=self.audio_callback,
-        )
+        self._record_action = None
+        self._reader_thread = None
+        if rtmixer is not None:
+            self.stream = rtmixer.Recorder(samplerate=SAMPLE_RATE, channels=CHANNELS, dtype='int16')
+            self._ringbuffer = rtmixer.RingBuffer(elementsize=2 * CHANNELS, size=RINGBUFFER_FRAMES)
+            self._read_block = np.empty((RINGBUFFER_FRAMES, CHANNELS), dtype='int16')
+        else:
+            self.stream = sd.InputStream(
+                samplerate=SAMPLE_RATE,
+                channels=CHANNELS,
+                dtype='int16',
+                callback=self.audio_callback,
+            )
         
         # Start background worker
         self.start_background_worker()
@@ -64,6 +103,9 @@ class AudioEngine:
     def _load_models_background(self):
         """Load models in background thread"""
         try:
+            # Compile (or load cached) audio kernels before the first recording needs them
+            warm_up_kernels(CHANNELS, TOTAL_WAVE_BARS, VOLUME_SENSITIVITY, LEVEL_SMOOTHING)
+            
             print("🔄 Starting background model loading...")
             self.model_manager.load_models()
             print("✅ Background model loading completed")
@@ -82,52 +124,128 @@ class AudioEngine:
         self.processing_worker = threading.Thread(target=self._processing_worker, daemon=True)
         self.processing_worker.start()
     
+    def _queue_chunk(self, task_type, chunk):
+        """Hand a copied chunk to the processing worker
+        
+        Chunks are transcribed from memory; debug WAVs are written by the chunks
+        manager's own I/O thread, so nothing here blocks on disk.
+        """
+        wav_file_path = self.chunks_manager.save_chunk_as_wav(chunk, SAMPLE_RATE) if DEBUG_SAVE_WAV else None
+        self.processing_queue.put({
+            'type': task_type,
+            'chunk': chunk,
+            'wav_path': wav_file_path
+        })
+    
     def _processing_worker(self):
         """Background worker for local model processing"""
+        deferred = _NO_TASK
         while True:
             try:
-                task = self.processing_queue.get(timeout=1)
+                task = self.processing_queue.get() if deferred is _NO_TASK else deferred
+                deferred = _NO_TASK
                 if task is None:
                     break
                 
                 if task['type'] == 'transcription':
-                    self._process_chunk_async(task['chunk'], task['wav_path'])
+                    # Chunks that piled up while the model was busy go through one batched call
+                    batch = [task]
+                    while not self.processing_queue.empty():
+                        queued = self.processing_queue.get_nowait()
+                        if queued is not None and queued['type'] == 'transcription':
+                            batch.append(queued)
+                        else:
+                            deferred = queued
+                            break
+                    
+                    if len(batch) > 1:
+                        self._process_chunk_batch_async(batch)
+                    else:
+                        self._process_chunk_async(task['chunk'], task['wav_path'])
                 elif task['type'] == 'final_chunk':
                     self._process_final_chunk_async(task['chunk'], task['wav_path'])
                 elif task['type'] == 'cleanup':
                     self._perform_cleanup_async()
+                elif task['type'] == 'end_session':
+                    self._end_session_async()
                     
-            except queue.Empty:
-                continue
             except Exception as e:
                 print(f"❌ Processing worker error: {e}")
     
     def audio_callback(self, indata, frames, time_info, status):
-        """Audio callback for recording"""
+        """Audio callback for recording (sounddevice fallback when rtmixer is unavailable)"""
         if self.is_recording:
-            with self.lock:
-                self.audio_buffer = np.vstack((self.audio_buffer, indata.copy()))
-                
-                # Audio visualization
-                mono_audio = np.mean(indata, axis=1) if len(indata.shape) > 1 else indata.flatten()
-                
-                if len(mono_audio) > 0:
-                    rms = np.sqrt(np.mean(mono_audio ** 2))
-                    normalized_volume = min(rms / VOLUME_SENSITIVITY, 1.0)
-                    
-                    new_levels = []
-                    for i in range(TOTAL_WAVE_BARS):
-                        time_offset = time.time() * 12 + i * 1.2
-                        frequency_factor = 0.5 + 0.8 * (math.sin(time_offset) * 0.5 + 0.5)
-                        bar_level = normalized_volume * frequency_factor
-                        
-                        current_val = self.audio_levels[i] if i < len(self.audio_levels) else 0
-                        smoothed = current_val * (1 - LEVEL_SMOOTHING) + bar_level * LEVEL_SMOOTHING
-                        new_levels.append(min(smoothed, 1.0))
-                    
-                    self.audio_levels = new_levels
-                else:
-                    self.audio_levels = [val * AUDIO_DECAY_RATE for val in self.audio_levels]
+            self._store_audio_block(indata)
+    
+    def _ringbuffer_reader(self):
+        """Drain the rtmixer ring buffer into the recording buffer until recording stops"""
+        while True:
+            recording = self.is_recording
+            available = self._ringbuffer.read_available
+            if available:
+                block = self._read_block[:available]
+                self._ringbuffer.readinto(block)
+                self._store_audio_block(block)
+            elif not recording:
+                break
+            else:
+                time.sleep(0.01)
+    
+    def _store_audio_block(self, indata):
+        """Append a block of frames and update the visualization levels"""
+        # indata is only valid during the callback: this copy into the preallocated buffer is the only one
+        end_pos = self.write_pos + len(indata)
+        if end_pos > len(self.audio_buffer):
+            self._grow_audio_buffer(end_pos)
+        np.copyto(self.audio_buffer[self.write_pos:end_pos], indata)
+        self.write_pos = end_pos
+        
+        # Audio visualization
+        if NUMBA_AVAILABLE:
+            if len(indata) > 0:
+                update_levels(indata, self.audio_levels, self._bar_phase, time.time(),
+                              float(VOLUME_SENSITIVITY), float(LEVEL_SMOOTHING))
+            else:
+                self.audio_levels *= np.float32(AUDIO_DECAY_RATE)
+            return
+        
+        frames = len(indata)
+        
+        if frames > 0:
+            channels = indata.shape[1]
+            if channels == 1:
+                # Mono: fused square-and-sum in a single pass over the int16 samples
+                sum_squares = np.einsum('ij,ij->', indata, indata, dtype=np.int64)
+            else:
+                # Integer channel sum into a reused buffer, then one dot product (no float temporaries)
+                if frames > len(self._mono_scratch):
+                    self._mono_scratch = np.empty(frames, dtype=np.int64)
+                mono_sum = self._mono_scratch[:frames]
+                np.sum(indata, axis=1, dtype=np.int64, out=mono_sum)
+                sum_squares = np.dot(mono_sum, mono_sum)
+            rms = math.sqrt(sum_squares / (frames * channels * channels))
+            normalized_volume = min(rms / VOLUME_SENSITIVITY, 1.0)
+            
+            # All bars in one vectorized update
+            time_offset = time.time() * 12 + self._bar_phase
+            frequency_factor = 0.5 + 0.8 * (np.sin(time_offset) * 0.5 + 0.5)
+            smoothed = self.audio_levels * (1 - LEVEL_SMOOTHING) + normalized_volume * frequency_factor * LEVEL_SMOOTHING
+            self.audio_levels = np.minimum(smoothed, 1.0).astype(np.float32)
+        else:
+            self.audio_levels = self.audio_levels * np.float32(AUDIO_DECAY_RATE)
+    
+    def _grow_audio_buffer(self, min_samples):
+        """Double the recording buffer capacity (audio writer thread only)"""
+        new_buffer = np.empty((max(min_samples, 2 * len(self.audio_buffer)), CHANNELS), dtype='int16')
+        new_buffer[:self.write_pos] = self.audio_buffer[:self.write_pos]
+        self.audio_buffer = new_buffer
+    
+    def _to_model_audio(self, chunk_array):
+        """Convert int16 frames to the float32 mono [-1, 1] samples the audio model expects"""
+        mono = chunk_array[:, 0] if chunk_array.shape[1] == 1 else chunk_array.mean(axis=1)
+        audio = mono.astype(np.float32)
+        audio *= np.float32(1.0 / 32768.0)
+        return audio
     
     def _process_chunk_async(self, chunk_array, wav_file_path):
         """Process chunk with local transcription model"""
@@ -140,48 +258,64 @@ class AudioEngine:
                 print("❌ Model manager not available")
                 return
             
-            # Run async transcription in new event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            # Run async transcription on the persistent event loop (from memory, never waiting on the WAV writer)
+            coro = self.model_manager.transcribe_audio_array(self._to_model_audio(chunk_array), SAMPLE_RATE)
+            future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+            self._store_chunk_transcription(future.result())
             
-            try:
-                transcription = loop.run_until_complete(
-                    self.model_manager.transcribe_audio_chunk(wav_file_path)
-                )
-            finally:
-                loop.close()
+        except Exception as e:
+            self._report_chunk_error(e)
+    
+    def _process_chunk_batch_async(self, tasks):
+        """Process several queued chunks with one batched transcription call"""
+        try:
+            print(f"🎙️ Processing {len(tasks)} queued chunks locally in one batch")
             
-            self.chunks_sent += 1
-            elapsed = int(time.time() - self.recording_start_time)
+            # Check if model manager is available and models are loaded
+            if not hasattr(self, 'model_manager') or self.model_manager is None:
+                print("❌ Model manager not available")
+                return
             
-            # Store chunk transcript
-            if transcription.strip() and not transcription.startswith('[Transcription Error'):
-                self.chunk_transcripts.append(transcription.strip())
-                print(f"📝 Chunk {self.chunks_sent}: {len(transcription)} chars • {elapsed}s")
-                print(f"📋 Content: {transcription[:50]}..." if len(transcription) > 50 else f"📋 Content: {transcription}")
-                
-                # Update UI with chunk transcript
-                def update_ui():
-                    if 'update_status' in self.ui_callbacks:
-                        self.ui_callbacks['update_status']("Processing", COLORS.get('accent_orange', '#F59E0B'), "animate")
-                    if 'append_transcription' in self.ui_callbacks:
-                        self.ui_callbacks['append_transcription'](transcription)
-                
-                if 'schedule_ui_update' in self.ui_callbacks:
-                    self.ui_callbacks['schedule_ui_update'](update_ui)
-            else:
-                print(f"⚠️ Chunk {self.chunks_sent}: transcription failed or empty")
+            audio_arrays = [self._to_model_audio(task['chunk']) for task in tasks]
+            future = asyncio.run_coroutine_threadsafe(self.model_manager.transcribe_audio_batch(audio_arrays), self._loop)
+            for transcription in future.result():
+                self._store_chunk_transcription(transcription)
                 
         except Exception as e:
-            print(f"❌ Chunk processing exception: {e}")
-            def update_error():
-                if 'update_status' in self.ui_callbacks:
-                    self.ui_callbacks['update_status']("❌ Processing error", COLORS.get('accent_danger', '#DC2626'), "error")
-                if 'append_transcription' in self.ui_callbacks:
-                    self.ui_callbacks['append_transcription'](f"[Processing Error]: {str(e)}")
+            self._report_chunk_error(e)
+    
+    def _store_chunk_transcription(self, transcription):
+        """Store a chunk transcript and show it in the UI"""
+        self.chunks_sent += 1
+        elapsed = int(time.time() - self.recording_start_time)
+        
+        # Store chunk transcript
+        if transcription.strip() and not transcription.startswith('[Transcription Error'):
+            self.chunk_transcripts.append(transcription.strip())
+            self._joined_transcript = None
+            print(f"📝 Chunk {self.chunks_sent}: {len(transcription)} chars • {elapsed}s")
+            print(f"📋 Content: {transcription[:50]}..." if len(transcription) > 50 else f"📋 Content: {transcription}")
             
-            if 'schedule_ui_update' in self.ui_callbacks:
-                self.ui_callbacks['schedule_ui_update'](update_error)
+            # Update UI with chunk transcript; these callbacks are thread-safe, the status
+            # joins the coalesced UI flush and the text goes straight into the transcription ring
+            if 'update_status' in self.ui_callbacks:
+                self.ui_callbacks['update_status']("Processing", COLORS.get('accent_orange', '#F59E0B'), "animate")
+            if 'append_transcription' in self.ui_callbacks:
+                self.ui_callbacks['append_transcription'](transcription)
+        else:
+            print(f"⚠️ Chunk {self.chunks_sent}: transcription failed or empty")
+    
+    def _report_chunk_error(self, e):
+        """Log a chunk processing failure and show it in the UI"""
+        print(f"❌ Chunk processing exception: {e}")
+        def update_error():
+            if 'update_status' in self.ui_callbacks:
+                self.ui_callbacks['update_status']("❌ Processing error", COLORS.get('accent_danger', '#DC2626'), "error")
+            if 'append_transcription' in self.ui_callbacks:
+                self.ui_callbacks['append_transcription'](f"[Processing Error]: {str(e)}")
+        
+        if 'schedule_ui_update' in self.ui_callbacks:
+            self.ui_callbacks['schedule_ui_update'](update_error)
     
     def _process_final_chunk_async(self, chunk_array, wav_file_path):
         """Process final chunk with local transcription"""
@@ -203,48 +337,44 @@ class AudioEngine:
             print(f"❌ Final chunk error: {e}")
             self.chunks_manager.end_session()
     
+    def _end_session_async(self):
+        """End the session when the recording left no final chunk"""
+        self.chunks_manager.end_session()
+        
+        def signal_complete():
+            if 'update_status' in self.ui_callbacks:
+                self.ui_callbacks['update_status']("Complete", COLORS.get('accent_success', '#059669'), "animate")
+        
+        if 'schedule_ui_update' in self.ui_callbacks:
+            self.ui_callbacks['schedule_ui_update'](signal_complete)
+    
     def periodic_send(self):
         """Send chunks periodically for real-time transcription"""
         chunk_samples = int(CHUNK_SECONDS * SAMPLE_RATE)
+        overlap_samples = int(CHUNK_OVERLAP_SECONDS * SAMPLE_RATE)
         
         while self.is_recording:
             current_time = time.time()
             if current_time - self.last_sent_time >= SEND_INTERVAL:
-                with self.lock:
-                    total_samples = self.audio_buffer.shape[0]
-                    
-                    if total_samples > self.last_sent_sample_count:
-                        new_samples_available = total_samples - self.last_sent_sample_count
-                        
-                        if new_samples_available >= chunk_samples:
-                            start_idx = total_samples - chunk_samples
-                            chunk = self.audio_buffer[start_idx:total_samples].copy()
-                            self.last_sent_sample_count = total_samples
-                            
-                            print(f"📤 Sending chunk for local processing: samples {start_idx}-{total_samples}")
-                            
-                        elif new_samples_available > 0 and (current_time - self.recording_start_time) >= 2.0:
-                            start_idx = self.last_sent_sample_count
-                            chunk = self.audio_buffer[start_idx:total_samples].copy()
-                            self.last_sent_sample_count = total_samples
-                            
-                            print(f"📤 Sending partial chunk: samples {start_idx}-{total_samples}")
-                        else:
-                            chunk = None
-                    else:
-                        chunk = None
+                ranges = []
+                total_samples = self.write_pos
+                new_samples_available = total_samples - self.last_sent_sample_count
                 
-                if chunk is not None:
-                    # Save chunk as WAV file
-                    audio_b64, wav_file_path = self.chunks_manager.save_chunk_as_wav(chunk, SAMPLE_RATE)
-                    
-                    if wav_file_path:
-                        self.processing_queue.put({
-                            'type': 'transcription',
-                            'chunk': chunk,
-                            'wav_path': wav_file_path
-                        })
-                        self.last_sent_time = current_time
+                if new_samples_available > 0 and (new_samples_available >= chunk_samples or
+                                                  (current_time - self.recording_start_time) >= 2.0):
+                    # Send only unsent audio (plus optional context), split into chunks of at most CHUNK_SECONDS
+                    for start_idx in range(self.last_sent_sample_count, total_samples, chunk_samples):
+                        end_idx = min(start_idx + chunk_samples, total_samples)
+                        ranges.append((max(start_idx - overlap_samples, 0), end_idx))
+                    self.last_sent_sample_count = total_samples
+                
+                # Copy each range now: once a new session resets write_pos its frames get overwritten,
+                # and a chunk still waiting in the queue would otherwise carry the new session's audio
+                for start_idx, end_idx in ranges:
+                    print(f"📤 Sending chunk for local processing: samples {start_idx}-{end_idx}")
+                    self._queue_chunk('transcription', self.audio_buffer[start_idx:end_idx].copy())
+                if ranges:
+                    self.last_sent_time = current_time
                     
             time.sleep(0.1)
     
@@ -261,19 +391,23 @@ class AudioEngine:
         
         self.is_recording = True
         self.chunks_sent = 0
-        self.audio_levels = [0.0] * TOTAL_WAVE_BARS
+        self.audio_levels = np.zeros(TOTAL_WAVE_BARS, dtype=np.float32)
         self.recording_start_time = time.time()
         
         # Reset transcripts
         self.last_sent_sample_count = 0
-        self.chunk_transcripts = []
+        self.clear_transcripts()
         
-        with self.lock:
-            self.audio_buffer = np.empty((0, CHANNELS), dtype='int16')
+        self.write_pos = 0
         self.last_sent_time = time.time() - SEND_INTERVAL
         
         try:
             self.stream.start()
+            if rtmixer is not None:
+                self._ringbuffer.flush()
+                self._record_action = self.stream.record_ringbuffer(self._ringbuffer)
+                self._reader_thread = threading.Thread(target=self._ringbuffer_reader, daemon=True)
+                self._reader_thread.start()
             self.sender_thread = threading.Thread(target=self.periodic_send, daemon=True)
             self.sender_thread.start()
             
@@ -292,7 +426,7 @@ class AudioEngine:
             
         print("🛑 Stopping recording...")
         self.is_recording = False
-        self.audio_levels = [0.0] * TOTAL_WAVE_BARS
+        self.audio_levels = np.zeros(TOTAL_WAVE_BARS, dtype=np.float32)
         
         if 'update_status' in self.ui_callbacks:
             self.ui_callbacks['update_status']("Finalizing...", COLORS.get('accent_warning', '#F59E0B'), "animate")
@@ -304,45 +438,36 @@ class AudioEngine:
     def _perform_cleanup_async(self):
         """Cleanup and process final chunk if needed"""
         try:
-            # Process final chunk if any remaining audio
-            with self.lock:
-                total_samples = self.audio_buffer.shape[0]
-                remaining_samples = total_samples - self.last_sent_sample_count
-                
-                print(f"🔍 Cleanup: {remaining_samples} remaining samples")
-                
-                if remaining_samples > int(0.3 * SAMPLE_RATE):
-                    remaining_chunk = self.audio_buffer[self.last_sent_sample_count:total_samples].copy()
-                    
-                    # Save final chunk as WAV
-                    audio_b64, wav_file_path = self.chunks_manager.save_chunk_as_wav(remaining_chunk, SAMPLE_RATE)
-                    
-                    if wav_file_path:
-                        self.processing_queue.put({
-                            'type': 'final_chunk',
-                            'chunk': remaining_chunk,
-                            'wav_path': wav_file_path
-                        })
-                else:
-                    # No final chunk, end session now
-                    self.chunks_manager.end_session()
-                    def signal_complete():
-                        if 'update_status' in self.ui_callbacks:
-                            self.ui_callbacks['update_status']("Complete", COLORS.get('accent_success', '#059669'), "animate")
-                    
-                    if 'schedule_ui_update' in self.ui_callbacks:
-                        self.ui_callbacks['schedule_ui_update'](signal_complete)
+            # Let the sender queue its last range
+            if self.sender_thread and self.sender_thread.is_alive():
+                self.sender_thread.join(timeout=2)
             
-            # Stop audio stream
+            # Stop audio stream so write_pos no longer moves
             try:
+                if self._record_action is not None:
+                    self.stream.cancel(self._record_action)
+                    self._record_action = None
                 self.stream.stop()
                 print("🔇 Audio stream stopped")
             except Exception as e:
                 print(f"❌ Error stopping stream: {e}")
             
-            # Wait for sender thread
-            if self.sender_thread and self.sender_thread.is_alive():
-                self.sender_thread.join(timeout=2)
+            # Let the ring buffer reader store the last frames before taking the final chunk
+            if self._reader_thread and self._reader_thread.is_alive():
+                self._reader_thread.join(timeout=2)
+            
+            # Process final chunk if any remaining audio
+            total_samples = self.write_pos
+            remaining_samples = total_samples - self.last_sent_sample_count
+            
+            print(f"🔍 Cleanup: {remaining_samples} remaining samples")
+            
+            if remaining_samples > int(0.3 * SAMPLE_RATE):
+                # Queue the final chunk behind any chunks still waiting for transcription
+                self._queue_chunk('final_chunk', self.audio_buffer[self.last_sent_sample_count:total_samples].copy())
+            else:
+                # No final chunk, end the session once pending chunks are processed
+                self.processing_queue.put({'type': 'end_session'})
             
         except Exception as e:
             print(f"❌ Cleanup error: {e}")
@@ -356,11 +481,18 @@ class AudioEngine:
     
     def get_audio_levels(self):
         """Get audio levels"""
-        return self.audio_levels.copy()
+        return self.audio_levels.tolist()
     
     def get_full_transcription(self):
         """Get combined transcription from all chunks"""
-        return " ".join(self.chunk_transcripts)
+        if self._joined_transcript is None:
+            self._joined_transcript = " ".join(self.chunk_transcripts)
+        return self._joined_transcript
+    
+    def clear_transcripts(self):
+        """Clear all chunk transcripts"""
+        self.chunk_transcripts = []
+        self._joined_transcript = None
     
     def shutdown(self):
         """Shutdown with model cleanup"""
@@ -375,6 +507,8 @@ class AudioEngine:
             self.processing_queue.put(None)
             if hasattr(self, 'stream'):
                 self.stream.close()
+            
+            self._loop.call_soon_threadsafe(self._loop.stop)
                 
             print("🧹 Audio engine shutdown complete")
         except Exception as e:
@@ -431,18 +565,12 @@ class LocalReportGenerator:
                 
                 print("-" * 50)
                 
-                # Run async report generation
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                try:
-                    report = loop.run_until_complete(
-                        model_manager.generate_medical_report(
-                            transcription_text, report_type, language, attachment
-                        )
+                # Run async report generation (one-shot, so a short-lived loop is enough)
+                report = asyncio.run(
+                    model_manager.generate_medical_report(
+                        transcription_text, report_type, language, attachment
                     )
-                finally:
-                    loop.close()
+                )
                 
                 print("✅ LOCAL REPORT SUCCESS")
                 print(f"📄 Output: {len(report)} chars")
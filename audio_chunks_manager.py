@@ -4,12 +4,29 @@
 # ============================================================================
 
 import os
-from scipy.io.wavfile import write
+import queue
+import struct
+import threading
 from datetime import datetime
-import io
-import base64
 from config import SAMPLE_RATE
 
+# 44-byte PCM RIFF header: RIFF size, fmt chunk (16 bytes) and data chunk size
+_WAV_HEADER_TEMPLATE = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+def write_wav(path, data, sample_rate=SAMPLE_RATE):
+    """Write int16 PCM frames to a WAV file with a hand-built header"""
+    channels = data.shape[1] if data.ndim > 1 else 1
+    sample_width = data.dtype.itemsize
+    header = _WAV_HEADER_TEMPLATE.pack(
+        b'RIFF', 36 + data.nbytes, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate,
+        sample_rate * channels * sample_width, channels * sample_width, 8 * sample_width,
+        b'data', data.nbytes
+    )
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(memoryview(data).cast('B') if data.flags['C_CONTIGUOUS'] else data.tobytes())
+
 class AudioChunksManager:
     """Simple manager for saving audio chunks as WAV files"""
     
@@ -19,6 +36,23 @@ class AudioChunksManager:
         self.chunk_counter = 0
         self.session_started = False
         self.ensure_audio_directory()
+        
+        # WAV files are written by one background I/O thread so callers never wait on the disk
+        self._io_queue = queue.SimpleQueue()
+        threading.Thread(target=self._io_worker, daemon=True).start()
+    
+    def _io_worker(self):
+        """Write queued chunks to disk in the background"""
+        while True:
+            wav_file_path, chunk_array, sample_rate, chunk_number = self._io_queue.get()
+            try:
+                write_wav(wav_file_path, chunk_array, sample_rate)
+                
+                # Log chunk info
+                chunk_duration = len(chunk_array) / sample_rate
+                print(f"💾 Saved chunk {chunk_number}: {chunk_duration:.1f}s → {wav_file_path}")
+            except Exception as e:
+                print(f"❌ Error saving chunk {chunk_number}: {e}")
     
     def ensure_audio_directory(self):
         """Create audio directory if it doesn't exist"""
@@ -48,23 +82,15 @@ class AudioChunksManager:
     
     def save_chunk_as_wav(self, chunk_array, sample_rate=SAMPLE_RATE):
         """
-        Save audio chunk as WAV file and return base64
+        Queue audio chunk to be saved as a WAV file in the background
         
         Returns:
-            tuple: (base64_data, wav_file_path)
+            str: wav_file_path the chunk will be written to, or None if no session is active
         """
-        # Create base64 for debugging
-        bio = io.BytesIO()
-        write(bio, sample_rate, chunk_array)
-        bio.seek(0)
-        audio_bytes = bio.read()
-        audio_b64_raw = base64.b64encode(audio_bytes).decode('utf-8')
-        base64_data = f"data:audio/wav;base64,{audio_b64_raw}"
-        
         # Only save WAV file if session is properly started
         if not self.session_started or self.session_id is None:
             print("⚠️ No active session - chunk not saved to WAV")
-            return base64_data, None
+            return None
         
         # Increment chunk counter
         self.chunk_counter += 1
@@ -74,19 +100,9 @@ class AudioChunksManager:
         session_dir = os.path.join(self.audio_dir, self.session_id)
         wav_file_path = os.path.join(session_dir, chunk_filename)
         
-        try:
-            # Save as WAV file
-            write(wav_file_path, sample_rate, chunk_array)
-            
-            # Log chunk info
-            chunk_duration = len(chunk_array) / sample_rate
-            print(f"💾 Saved chunk {self.chunk_counter}: {chunk_duration:.1f}s → {wav_file_path}")
-            
-            return base64_data, wav_file_path
-            
-        except Exception as e:
-            print(f"❌ Error saving chunk {self.chunk_counter}: {e}")
-            return base64_data, None
+        # Returns immediately; the file lands on disk shortly after
+        self._io_queue.put((wav_file_path, chunk_array, sample_rate, self.chunk_counter))
+        return wav_file_path
     
     def end_session(self):
         """End current recording session"""
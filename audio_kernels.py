@@ -0,0 +1,50 @@
+# audio_kernels.py
+# ============================================================================
+# Compiled Audio Kernels - RMS and visualization level updates
+# ============================================================================
+
+import numpy as np
+
+# Numba is optional; without it the audio engine keeps its NumPy implementation
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    NUMBA_AVAILABLE = False
+
+
+def _update_levels(indata, audio_levels, phase, t, vol_sens, smoothing):
+    """Update the bar levels in place from one block of int16 frames"""
+    frames, channels = indata.shape
+    if frames == 0:
+        return
+    
+    # Fused channel mean + square + sum in a single pass over the block
+    total = 0.0
+    for i in range(frames):
+        mono = 0.0
+        for c in range(channels):
+            mono += indata[i, c]
+        mono /= channels
+        total += mono * mono
+    
+    rms = np.sqrt(total / frames)
+    volume = min(rms / vol_sens, 1.0)
+    
+    t12 = t * 12
+    for i in range(audio_levels.shape[0]):
+        frequency_factor = 0.5 + 0.8 * (np.sin(t12 + phase[i]) * 0.5 + 0.5)
+        smoothed = audio_levels[i] * (1 - smoothing) + volume * frequency_factor * smoothing
+        audio_levels[i] = min(smoothed, 1.0)
+
+
+update_levels = njit(cache=True, fastmath=True)(_update_levels) if NUMBA_AVAILABLE else None
+
+
+def warm_up_kernels(channels, total_bars, vol_sens, smoothing):
+    """Compile (or load from cache) the kernels so the first recording has no JIT stall"""
+    if not NUMBA_AVAILABLE:
+        return
+    update_levels(np.zeros((1, channels), dtype=np.int16), np.zeros(total_bars, dtype=np.float32),
+                  np.zeros(total_bars, dtype=np.float32), 0.0, float(vol_sens), float(smoothing))
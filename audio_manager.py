@@ -3,9 +3,27 @@
 # Audio UI Management and Controls
 # ============================================================================
 
+import asyncio
+import os
+import time
 import tkinter as tk
 from tkinter import ttk
-from config import COLORS
+from config import (
+    ACCENT_DANGER, ACCENT_INFO, ACCENT_ORANGE, ACCENT_SUCCESS, ACCENT_WARNING,
+    BG_CARD, BG_SURFACE, PRIMARY, SHADOW_LIGHT, TEXT_MUTED, TEXT_PRIMARY, TEXT_SECONDARY,
+)
+
+# Verbose progress logging, enabled with MEDREPORT_DEBUG=1 (errors and warnings always print)
+_DEBUG = __debug__ and os.environ.get('MEDREPORT_DEBUG') == '1'
+if _DEBUG:
+    _dbg = print
+else:
+    def _dbg(*args, **kwargs):
+        pass
+
+# Precomputed "MM:SS" labels for the first two hours of recording
+_TIMER_STRINGS_LIMIT = 7200
+_TIMER_STRINGS = [f"{i // 60:02d}:{i % 60:02d}" for i in range(_TIMER_STRINGS_LIMIT + 1)]
 
 class AudioUIManager:
     """Manages the audio recording UI components and interactions"""
@@ -22,34 +40,45 @@ class AudioUIManager:
         
         # State tracking
         self.chronometer_running = False
+        
+        # Colors used on every chronometer tick and status change
+        self._color_normal, self._color_warn, self._color_danger, self._color_info, self._color_success = (
+            TEXT_SECONDARY, ACCENT_WARNING, ACCENT_DANGER, ACCENT_INFO, ACCENT_SUCCESS)
+        
+        # Last (text, color) shown by the timer label, to skip no-op reconfigures
+        self._last_timer = (None, None)
+        
+        # Chronometer ticks run as a task on the UI's Tk-pumped asyncio loop
+        self._start_mono = 0.0
+        self._chrono_task = None
     
     def create_audio_section(self, parent, section_font, create_button_tooltip_func):
         """Create the complete audio recording section"""
         # Audio visualization frame
-        audio_frame = tk.Frame(parent, bg=COLORS['bg_card'], relief='flat', bd=0)
+        audio_frame = tk.Frame(parent, bg=BG_CARD, relief='flat', bd=0)
         audio_frame.pack(side='left', fill='both', expand=True, padx=(0, 15))
         
         # Shadow effect
-        audio_shadow = tk.Frame(parent, height=2, bg=COLORS['shadow_light'])
+        audio_shadow = tk.Frame(parent, height=2, bg=SHADOW_LIGHT)
         audio_shadow.place(in_=audio_frame, relx=0, rely=1, relwidth=1)
         
         # Header with recording controls
-        audio_header = tk.Frame(audio_frame, bg=COLORS['bg_card'])
+        audio_header = tk.Frame(audio_frame, bg=BG_CARD)
         audio_header.pack(fill='x', padx=20, pady=(25, 10))
         
         # Title
-        audio_title_container = tk.Frame(audio_header, bg=COLORS['bg_card'])
+        audio_title_container = tk.Frame(audio_header, bg=BG_CARD)
         audio_title_container.pack(side='left')
         
         tk.Label(audio_title_container, text="🎵", font=("Segoe UI", 18),
-                 bg=COLORS['bg_card'], fg=COLORS['accent_orange']).pack(side='left', padx=(0, 10))
+                 bg=BG_CARD, fg=ACCENT_ORANGE).pack(side='left', padx=(0, 10))
         
         audio_title = tk.Label(audio_title_container, text="Audio Recorder", font=section_font,
-                              bg=COLORS['bg_card'], fg=COLORS['text_primary'])
+                              bg=BG_CARD, fg=TEXT_PRIMARY)
         audio_title.pack(side='left')
         
         # Recording controls
-        controls_container = tk.Frame(audio_header, bg=COLORS['bg_card'])
+        controls_container = tk.Frame(audio_header, bg=BG_CARD)
         controls_container.pack(side='right', padx=(0, 20))
         
         # Record button
@@ -61,32 +90,32 @@ class AudioUIManager:
         
         # Audio wave canvas
         from config import WAVE_CANVAS_HEIGHT
-        self.wave_canvas = tk.Canvas(audio_frame, height=WAVE_CANVAS_HEIGHT, bg=COLORS['bg_surface'],
+        self.wave_canvas = tk.Canvas(audio_frame, height=WAVE_CANVAS_HEIGHT, bg=BG_SURFACE,
                                 highlightthickness=0, relief='flat', bd=0)
         self.wave_canvas.pack(fill='x', padx=20, pady=(15, 10))
         
         # Bottom status area
-        status_area = tk.Frame(audio_frame, bg=COLORS['bg_card'])
+        status_area = tk.Frame(audio_frame, bg=BG_CARD)
         status_area.pack(fill='x', padx=20, pady=(15, 15))
         
         # Timer
-        timer_container = tk.Frame(status_area, bg=COLORS['bg_surface'], relief='flat', bd=0)
+        timer_container = tk.Frame(status_area, bg=BG_SURFACE, relief='flat', bd=0)
         timer_container.pack(side='left')
         
         tk.Label(timer_container, text="⏱️", font=("Segoe UI", 12),
-                 bg=COLORS['bg_surface'], fg=COLORS['primary']).pack(side='left', padx=(10, 5))
+                 bg=BG_SURFACE, fg=PRIMARY).pack(side='left', padx=(10, 5))
         
         self.timer_label = tk.Label(timer_container, text="00:00", font=("Segoe UI", 16),
-                                  bg=COLORS['bg_surface'], fg=COLORS['text_secondary'])
+                                  bg=BG_SURFACE, fg=TEXT_SECONDARY)
         self.timer_label.pack(side='left', padx=(0, 10))
         
         # Status
         self.status_label = tk.Label(status_area, text="Initialization...", font=("Segoe UI", 12),
-                                   bg=COLORS['bg_card'], fg=COLORS['text_secondary'])
+                                   bg=BG_CARD, fg=TEXT_SECONDARY)
         self.status_label.pack(side='right')
         
-        # Tips section
-        self.create_tips_section(audio_frame)
+        # Tips section (non-critical, built once Tk is idle so the recorder paints first)
+        audio_frame.after_idle(self.create_tips_section, audio_frame)
         
         return audio_frame
     
@@ -94,22 +123,22 @@ class AudioUIManager:
         """Create tips section for audio recording"""
         from config import TIPS_TEXT
         
-        tips_section = tk.Frame(parent, bg=COLORS['bg_card'], relief='flat', bd=0)
+        tips_section = tk.Frame(parent, bg=BG_CARD, relief='flat', bd=0)
         tips_section.pack(fill='x', padx=20, pady=(10, 15))
         
         # Header
-        tips_header = tk.Frame(tips_section, bg=COLORS['bg_card'])
+        tips_header = tk.Frame(tips_section, bg=BG_CARD)
         tips_header.pack(fill='x')
         
         tk.Label(tips_header, text="💡 Pro Tips", font=("Segoe UI", 12),
-                 bg=COLORS['bg_card'], fg=COLORS['text_secondary']).pack(anchor='w', padx=20, pady=8)
+                 bg=BG_CARD, fg=TEXT_SECONDARY).pack(anchor='w', padx=20, pady=8)
         
         # Tips content
-        tips_content = tk.Frame(tips_section, bg=COLORS['bg_card'])
+        tips_content = tk.Frame(tips_section, bg=BG_CARD)
         tips_content.pack(fill='x', padx=20, pady=(0, 10))
         
         tk.Label(tips_content, text=TIPS_TEXT, font=("Segoe UI", 9), justify='left',
-                 bg=COLORS['bg_card'], fg=COLORS['text_muted']).pack(anchor='w')
+                 bg=BG_CARD, fg=TEXT_MUTED).pack(anchor='w')
     
     def on_record_click(self):
         """Handle record button click"""
@@ -128,34 +157,34 @@ class AudioUIManager:
     
     def start_recording(self):
         """Start recording process"""
-        print("🎬 Starting recording from audio manager...")
+        _dbg("🎬 Starting recording from audio manager...")
         
         # Update button appearance
         self.record_button.config(text="STOP", style="CompactStop.TButton")
-        self.update_status("Starting...", COLORS['accent_info'])
+        self.update_status("Starting...", self._color_info)
         
         if self.audio_engine.start_recording():
-            self.update_status("Recording", COLORS['accent_danger'])
+            self.update_status("Recording", self._color_danger)
             self.start_chronometer()
-            print("✅ Recording started successfully")
+            _dbg("✅ Recording started successfully")
             return True
         else:
             # Revert UI if start failed
             self.record_button.config(text="START", style="CompactRecording.TButton")
-            self.update_status("Failed to start", COLORS['accent_danger'])
+            self.update_status("Failed to start", self._color_danger)
             return False
     
     def stop_recording(self):
         """Stop recording process"""
-        print("🛑 Stopping recording from audio manager...")
+        _dbg("🛑 Stopping recording from audio manager...")
         
         # Update button appearance
         self.record_button.config(text="START", style="CompactRecording.TButton")
-        self.update_status("Finalizing...", COLORS['accent_warning'])
+        self.update_status("Finalizing...", self._color_warn)
         
         if self.audio_engine.stop_recording():
             self.stop_chronometer()
-            print("✅ Stop initiated")
+            _dbg("✅ Stop initiated")
             return True
         else:
             print("❌ Failed to stop recording")
@@ -163,77 +192,100 @@ class AudioUIManager:
     
     def start_chronometer(self):
         """Start the chronometer timer"""
-        print("⏰ Starting chronometer...")
+        _dbg("⏰ Starting chronometer...")
         self.chronometer_running = True
-        self.timer_label.config(text="00:00", fg=COLORS['text_secondary'])
-        self._update_chronometer()
+        self._set_timer("00:00", self._color_normal)
+        # Started right after the engine starts recording; ticks measure elapsed time from here
+        self._start_mono = time.monotonic()
+        self._cancel_chronometer_task()
+        
+        loop = getattr(self.ui_callbacks, 'asyncio_loop', None)
+        if loop is not None and not loop.is_closed():
+            self._chrono_task = loop.create_task(self._chronometer_task())
     
     def stop_chronometer(self):
         """Stop the chronometer timer"""
-        print("⏹️ Stopping chronometer")
+        _dbg("⏹️ Stopping chronometer")
         self.chronometer_running = False
+        self._cancel_chronometer_task()
     
     def reset_chronometer(self):
         """Reset the chronometer to 00:00"""
-        print("🔄 Resetting chronometer to 00:00")
+        _dbg("🔄 Resetting chronometer to 00:00")
         self.chronometer_running = False
+        self._cancel_chronometer_task()
         if self.timer_label:
-            self.timer_label.config(text="00:00", fg=COLORS['text_secondary'])
+            self._set_timer("00:00", self._color_normal)
             self.timer_label.update_idletasks()
         if self.status_label:
-            self.status_label.config(text="Ready", fg=COLORS['accent_success'])
+            self.status_label.config(text="Ready", fg=self._color_success)
             self.status_label.update_idletasks()
     
-    def _update_chronometer(self):
+    async def _chronometer_task(self):
+        """Chronometer loop on the Tk-pumped asyncio loop"""
+        while self.chronometer_running:
+            self._refresh_chronometer()
+            if not self.chronometer_running:
+                break
+            await asyncio.sleep(self._next_tick_delay() / 1000)
+    
+    def _cancel_chronometer_task(self):
+        """Cancel the asyncio chronometer task, if any"""
+        if self._chrono_task is not None:
+            self._chrono_task.cancel()
+            self._chrono_task = None
+    
+    def _next_tick_delay(self):
+        """Milliseconds until the next whole second since start, so drift never accumulates"""
+        delay = 1000 - int((time.monotonic() - self._start_mono) * 1000) % 1000
+        return max(1, delay)
+    
+    def _refresh_chronometer(self):
         """Update chronometer display"""
+        engine = self.audio_engine
+        start_mono = self._start_mono
         try:
-            if self.chronometer_running and self.audio_engine and self.audio_engine.is_recording:
-                elapsed = self.audio_engine.get_recording_elapsed_time()
+            if self.chronometer_running and engine and engine.is_recording:
+                # Local monotonic clock, measured from start_chronometer
+                elapsed = int(time.monotonic() - start_mono)
+                
+                if elapsed <= _TIMER_STRINGS_LIMIT:
+                    timer_text = _TIMER_STRINGS[elapsed]
+                else:
+                    timer_text = f"{elapsed // 60:02d}:{elapsed % 60:02d}"
                 
-                if elapsed >= 0:
-                    minutes = elapsed // 60
-                    seconds = elapsed % 60
-                    timer_text = f"{minutes:02d}:{seconds:02d}"
-                    
-                    # Color coding based on duration
-                    if elapsed > 300:  # 5 minutes
-                        color = COLORS['accent_danger']
-                    elif elapsed > 60:  # 1 minute
-                        color = COLORS['accent_warning']
-                    else:
-                        color = COLORS['text_secondary']
-                    
-                    if self.timer_label:
-                        self.timer_label.config(text=timer_text, fg=color)
-                    
-                    # Schedule next update
-                    if hasattr(self.ui_callbacks, 'schedule_ui_update'):
-                        self.ui_callbacks.schedule_ui_update(lambda: self._schedule_next_update())
-                    else:
-                        self._schedule_next_update()
+                # Color coding based on duration
+                if elapsed > 300:  # 5 minutes
+                    color = self._color_danger
+                elif elapsed > 60:  # 1 minute
+                    color = self._color_warn
                 else:
-                    self._schedule_next_update()
+                    color = self._color_normal
+                
+                if self.timer_label:
+                    self._set_timer(timer_text, color)
             else:
-                print("⏹️ Recording stopped - chronometer stopped")
+                _dbg("⏹️ Recording stopped - chronometer stopped")
                 self.chronometer_running = False
                 
         except Exception as e:
             print(f"❌ Chronometer error: {e}")
-            if self.chronometer_running:
-                self._schedule_next_update()
     
-    def _schedule_next_update(self):
-        """Schedule the next chronometer update"""
-        if self.chronometer_running:
-            if hasattr(self.ui_callbacks, 'root') and self.ui_callbacks.root:
-                self.ui_callbacks.root.after(1000, self._update_chronometer)
+    def _set_timer(self, timer_text, color):
+        """Reconfigure the timer label only when its text or color changes"""
+        if (timer_text, color) == self._last_timer:
+            return
+        self._last_timer = (timer_text, color)
+        self.timer_label.config(text=timer_text, fg=color)
     
-    def update_status(self, message, color=COLORS['text_secondary']):
+    def update_status(self, message, color=TEXT_SECONDARY):
         """Update the status label directly"""
         if self.status_label:
-            self.status_label.config(text=message, fg=color)
-            self.status_label.update_idletasks()
-            print(f"📊 Audio status: {message}")
+            # The label is also updated by the main UI and animations, so compare against its current state
+            status_label = self.status_label
+            if status_label.cget('text') != message or status_label.cget('fg') != color:
+                status_label.config(text=message, fg=color)
+                _dbg(f"📊 Audio status: {message}")
     
     def get_wave_canvas(self):
         """Get the wave canvas for animation"""
@@ -245,15 +297,16 @@ class AudioUIManager:
             self.record_button.config(text="START", style="CompactRecording.TButton")
         
         if self.timer_label:
-            self.timer_label.config(text="00:00", fg=COLORS['text_secondary'])
+            self._set_timer("00:00", self._color_normal)
         
         if self.status_label:
-            self.status_label.config(text="Ready", fg=COLORS['accent_success'])
+            self.status_label.config(text="Ready", fg=self._color_success)
         
         self.chronometer_running = False
-        print("🔄 Audio UI state reset")
+        _dbg("🔄 Audio UI state reset")
     
     def cleanup(self):
         """Cleanup audio UI manager"""
         self.chronometer_running = False
-        print("🧹 Audio UI manager cleaned up")
\ No newline at end of file
+        self._cancel_chronometer_task()
+        _dbg("🧹 Audio UI manager cleaned up")
\ No newline at end of file
@@ -3,6 +3,14 @@
 # Color Manipulation Utilities
 # ============================================================================
 
+from functools import lru_cache
+import numpy as np
+
+# Two-digit hex pair -> int lookup (lowercase and uppercase)
+_HEX2INT = {f'{i:02x}': i for i in range(256)}
+_HEX2INT.update({pair.upper(): value for pair, value in list(_HEX2INT.items())})
+
+@lru_cache(maxsize=512)
 def lighten_color(hex_color, factor):
     """
     Lighten a hex color by a factor
@@ -14,10 +22,7 @@ def lighten_color(hex_color, factor):
     Returns:
         str: Lightened hex color string
     """
-    hex_color = hex_color.lstrip('#')
-    r = int(hex_color[0:2], 16)
-    g = int(hex_color[2:4], 16)
-    b = int(hex_color[4:6], 16)
+    r, g, b = hex_to_rgb(hex_color)
     
     r = min(255, int(r + (255 - r) * factor))
     g = min(255, int(g + (255 - g) * factor))
@@ -25,6 +30,23 @@ def lighten_color(hex_color, factor):
     
     return f"#{r:02x}{g:02x}{b:02x}"
 
+def lighten_palette(hex_colors, factors):
+    """
+    Lighten many hex colors at once (vectorized lighten_color)
+    
+    Args:
+        hex_colors (list): Hex color strings
+        factors (float or list): One lightening factor for all colors, or one per color
+        
+    Returns:
+        list: Lightened hex color strings, in input order
+    """
+    rgb = np.array([hex_to_rgb(color) for color in hex_colors], dtype=np.float64).reshape(-1, 3)
+    f = np.asarray(factors, dtype=np.float64).reshape(-1, 1)
+    out = np.minimum(255, (rgb + (255 - rgb) * f).astype(np.int32))
+    return ['#%02x%02x%02x' % (r, g, b) for r, g, b in out.tolist()]
+
+@lru_cache(maxsize=512)
 def darken_color(hex_color, factor):
     """
     Darken a hex color by a factor
@@ -36,10 +58,7 @@ def darken_color(hex_color, factor):
     Returns:
         str: Darkened hex color string
     """
-    hex_color = hex_color.lstrip('#')
-    r = int(hex_color[0:2], 16)
-    g = int(hex_color[2:4], 16)
-    b = int(hex_color[4:6], 16)
+    r, g, b = hex_to_rgb(hex_color)
     
     r = max(0, int(r * (1 - factor)))
     g = max(0, int(g * (1 - factor)))
@@ -47,6 +66,7 @@ def darken_color(hex_color, factor):
     
     return f"#{r:02x}{g:02x}{b:02x}"
 
+@lru_cache(maxsize=256)
 def hex_to_rgb(hex_color):
     """
     Convert hex color to RGB tuple
@@ -57,8 +77,12 @@ def hex_to_rgb(hex_color):
     Returns:
         tuple: RGB values (r, g, b)
     """
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    h = hex_color.lstrip('#')
+    try:
+        return _HEX2INT[h[0:2]], _HEX2INT[h[2:4]], _HEX2INT[h[4:6]]
+    except KeyError:
+        # Mixed-case pairs such as 'Fa'
+        return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
 
 def rgb_to_hex(r, g, b):
     """
@@ -85,6 +109,12 @@ def adjust_brightness(hex_color, brightness_factor):
     Returns:
         str: Adjusted hex color string
     """
+    # Round slider-style floats so near-identical factors share a cache entry
+    return _adjust_brightness(hex_color, round(brightness_factor, 3))
+
+@lru_cache(maxsize=512)
+def _adjust_brightness(hex_color, brightness_factor):
+    """Cached implementation of adjust_brightness"""
     r, g, b = hex_to_rgb(hex_color)
     
     # Adjust each component
@@ -94,6 +124,7 @@ def adjust_brightness(hex_color, brightness_factor):
     
     return rgb_to_hex(r, g, b)
 
+@lru_cache(maxsize=512)
 def blend_colors(color1, color2, ratio=0.5):
     """
     Blend two colors together
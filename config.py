@@ -8,6 +8,14 @@ SAMPLE_RATE = 16000
 CHANNELS = 1
 CHUNK_SECONDS = 10      # X-second chunk length
 SEND_INTERVAL = 8       # Send new chunk every X seconds
+AUDIO_BUFFER_SECONDS = 600  # Preallocated recording buffer (doubles when a session runs longer)
+CHUNK_OVERLAP_SECONDS = 0  # Audio from the previous chunk repeated at the start of the next one for context
+DEBUG_SAVE_WAV = False  # Also save every chunk as a WAV file (chunks are transcribed from memory)
+
+# MODEL LOADING
+# Quantization strategies tried in order; add "awq"/"gptq" in front to opt in to the
+# prequantized <model>-awq / <model>-gptq checkpoints once they are published
+MODEL_QUANTIZATION_PREFERENCE = ["nf4", "fp16"]
 
 # APPLICATION SETTINGS
 APP_TITLE = "MedReport"
@@ -65,6 +73,10 @@ COLORS = {
     'selection': '#F1F5F9',           # Cool selection
 }
 
+# Every color is also exposed as an uppercase module constant (COLORS['bg_card'] -> BG_CARD)
+# so hot UI paths can import plain names instead of hashing dict keys
+globals().update({name.upper(): value for name, value in COLORS.items()})
+
 # GRADIENT WAVE COLORS
 WAVE_COLORS = [
     '#A78BFA',
@@ -85,6 +97,8 @@ LANGUAGES = ["English", "French", "Spanish", "German", "Italian", "Portuguese",
 WAVE_ANIMATION_DELAY = 40  # milliseconds
 TIMER_UPDATE_DELAY = 1000  # milliseconds
 STATUS_ANIMATION_DELAY = 200  # milliseconds
+TRANSCRIPTION_DRAIN_MS = 33  # milliseconds between transcription ring drains (~30 Hz)
+TRANSCRIPTION_RING_SIZE = 4096  # Pending transcription chunks kept before the oldest are dropped
 
 # UI DIMENSIONS
 WAVE_CANVAS_HEIGHT = 240
@@ -4,23 +4,53 @@
 # ============================================================================
 
 import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog
 from datetime import datetime
-from pdf_generator import rich_text_to_pdf_with_dialog
+from pdf_generator import get_save_path, write_pdf_document
+
+try:
+    import fitz as _fitz  # PyMuPDF
+except ImportError:
+    _fitz = None
+
+# Interval between UI polls for pages extracted in the background
+IMPORT_POLL_MS = 50
+
+# Verbose progress logging, enabled with MEDREPORT_DEBUG=1 (errors and warnings always print)
+_DEBUG = __debug__ and os.environ.get('MEDREPORT_DEBUG') == '1'
+if _DEBUG:
+    _dbg = print
+else:
+    def _dbg(*args, **kwargs):
+        pass
+
+# PyMuPDF span flag bits
+_BOLD_FLAG = 0x10
+_ITALIC_FLAG = 0x02
 
 class FileOperationsManager:
     """File import/export operations manager"""
     
-    def __init__(self):
+    # Single background worker so PDF parsing never blocks the Tk main loop
+    _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="FileOps")
+    
+    def __init__(self, root=None):
+        self.root = root  # parent for file dialogs; avoids a throwaway Tk per export
         self.imported_document_content = ""
     
-    def import_pdf_document(self, summary_text_widget=None):
-        """Import a PDF document and return its content with filename header"""
+    def import_pdf_document(self, summary_text_widget=None, on_complete=None, preserve_formatting=True):
+        """Import a PDF document with filename header
+        
+        With a widget, the text is extracted on a worker thread and the result
+        (success, content, message) is delivered to on_complete on the UI thread.
+        Without a widget, the import runs synchronously and returns that result.
+        preserve_formatting=False skips bold/italic inference for faster plain text.
+        """
         try:
-            # Try to import PyMuPDF
-            try:
-                import fitz  # PyMuPDF
-            except ImportError:
+            # PyMuPDF is resolved once at module import
+            if _fitz is None:
                 error_msg = "PyMuPDF library is required to import PDF files.\n\nPlease install it with:\npip install PyMuPDF"
                 print("❌ PyMuPDF not installed.")
                 if summary_text_widget:
@@ -39,124 +69,186 @@ class FileOperationsManager:
             )
             
             if not file_path:
-                print("ℹ️ Import cancelled by user")
+                _dbg("ℹ️ Import cancelled by user")
                 return False, "", "Import cancelled by user"
             
+            _dbg(f"📄 Importing document: {file_path}")
+            page_queue = queue.SimpleQueue()
+            
+            if summary_text_widget is None:
+                self._extract_pdf_document(file_path, page_queue, preserve_formatting)
+                pages = []
+                while True:
+                    kind, payload = page_queue.get()
+                    if kind != "page":
+                        return self._finish_import(payload, "".join(pages), None, on_complete)
+                    pages.append(payload)
+            
+            # Extract off the UI thread; pages are drawn as soon as each one is ready
+            self._executor.submit(self._extract_pdf_document, file_path, page_queue, preserve_formatting)
+            summary_text_widget.after(IMPORT_POLL_MS, self._drain_import_queue,
+                                      page_queue, summary_text_widget, on_complete, False)
+            return True, "", "Import started"
+            
+        except Exception as e:
+            error_msg = f"Error importing document: {str(e)}"
+            print(f"❌ {error_msg}")
+            if summary_text_widget:
+                error_text = f"❌ **Import Error**\n\nFailed to import document:\n{str(e)}"
+                summary_text_widget.insert_formatted_text(error_text, clear_first=True)
+            return False, "", error_msg
+    
+    def _extract_pdf_document(self, file_path, page_queue, preserve_formatting=True):
+        """Extract formatted text from a PDF page by page (worker thread, no Tk access)
+        
+        Puts ("page", text) for every page with content, then a final
+        ("done", (success, message, display_text)).
+        """
+        try:
             # Extract filename
             filename = os.path.basename(file_path)
-            print(f"📄 Importing document: {file_path}")
-            
-            # Read PDF content
-            doc = fitz.open(file_path)
-            formatted_content = ""
             
-            for page_num in range(doc.page_count):
-                page = doc.load_page(page_num)
-                text_dict = page.get_text("dict")
-                page_content = self._extract_formatted_text_from_dict(text_dict)
-                
-                if page_content.strip():
-                    formatted_content += page_content
-                    if page_num < doc.page_count - 1:
-                        formatted_content += "\n\n---\n\n"
+            font_lc_cache = {}  # Shared across pages: documents reuse a handful of fonts
+            has_content = False
             
-            doc.close()
+            # Read PDF content
+            with _fitz.open(file_path) as doc:
+                for page_num in range(doc.page_count):
+                    page = doc.load_page(page_num)
+                    if preserve_formatting:
+                        text_dict = page.get_text("dict")
+                        page_content = self._extract_formatted_text_from_dict(text_dict, font_lc_cache)
+                    else:
+                        # Plain mode skips span-level metadata entirely
+                        page_content = page.get_text("text")
+                    
+                    if not page_content.strip():
+                        continue
+                    
+                    if has_content:
+                        page_queue.put(("page", "\n\n---\n\n" + page_content))
+                    else:
+                        # Create formatted content with filename header
+                        page_queue.put(("page", f"*Imported from: {filename}*\n\n" + page_content.lstrip()))
+                        has_content = True
             
-            if not formatted_content.strip():
+            if not has_content:
                 error_msg = "No text content found in PDF"
                 print(f"⚠️ {error_msg}")
-                if summary_text_widget:
-                    error_text = f"⚠️ **Import Warning**\n\n{error_msg}"
-                    summary_text_widget.insert_formatted_text(error_text, clear_first=True)
-                return False, "", error_msg
-            
-            # Create formatted content with filename header
-            final_content = f"*Imported from: {filename}*\n\n" + formatted_content.strip()
+                page_queue.put(("done", (False, error_msg, f"⚠️ **Import Warning**\n\n{error_msg}")))
+                return
             
-            # Store the imported content
-            self.imported_document_content = final_content
-            
-            # Display if widget provided
-            if summary_text_widget:
-                summary_text_widget.insert_formatted_text(final_content, clear_first=True)
-            
-            success_msg = f"Document imported successfully: {len(final_content)} characters"
-            print(f"✅ {success_msg}")
-            
-            return True, final_content, success_msg
+            page_queue.put(("done", (True, "", None)))
             
         except Exception as e:
             error_msg = f"Error importing document: {str(e)}"
             print(f"❌ {error_msg}")
+            page_queue.put(("done", (False, error_msg, f"❌ **Import Error**\n\nFailed to import document:\n{str(e)}")))
+    
+    def _drain_import_queue(self, page_queue, summary_text_widget, on_complete, started):
+        """Append extracted pages to the widget as they arrive (UI thread)"""
+        while True:
+            try:
+                kind, payload = page_queue.get_nowait()
+            except queue.Empty:
+                summary_text_widget.after(IMPORT_POLL_MS, self._drain_import_queue,
+                                          page_queue, summary_text_widget, on_complete, started)
+                return
+            
+            if kind != "page":
+                content = summary_text_widget.get_raw_markdown() if started else ""
+                self._finish_import(payload, content, summary_text_widget, on_complete)
+                return
+            
+            summary_text_widget.insert_formatted_text(payload, clear_first=not started)
+            started = True
+    
+    def _finish_import(self, extraction, content, summary_text_widget, on_complete):
+        """Store an extraction result and report it (UI thread)"""
+        success, message, display_text = extraction
+        
+        if success:
+            # Store the imported content
+            content = content.strip()
+            self.imported_document_content = content
+            message = f"Document imported successfully: {len(content)} characters"
+            _dbg(f"✅ {message}")
+        else:
+            content = ""
+            # Replace any partially streamed pages with the warning/error
             if summary_text_widget:
-                error_text = f"❌ **Import Error**\n\nFailed to import document:\n{str(e)}"
-                summary_text_widget.insert_formatted_text(error_text, clear_first=True)
-            return False, "", error_msg
+                summary_text_widget.insert_formatted_text(display_text, clear_first=True)
+        
+        result = (success, content, message)
+        if on_complete:
+            on_complete(*result)
+        return result
     
-    def _extract_formatted_text_from_dict(self, text_dict):
+    def _extract_formatted_text_from_dict(self, text_dict, font_lc_cache=None):
         """Extract text with formatting from PyMuPDF text dictionary"""
-        formatted_text = ""
+        if font_lc_cache is None:
+            font_lc_cache = {}
+        # Collect pieces in lists and join once instead of repeated string +=
+        out = []
         
-        try:
-            for block in text_dict.get("blocks", []):
-                if "lines" not in block:  # Skip image blocks
-                    continue
+        for block in text_dict.get("blocks", []):
+            if "lines" not in block:  # Skip image blocks
+                continue
+            
+            block_parts = []
+            for line in block["lines"]:
+                line_parts = []
                 
-                block_text = ""
-                for line in block["lines"]:
-                    line_text = ""
+                for span in line.get("spans", ()):
+                    text = span.get("text", "")
+                    if not text.strip():
+                        continue
                     
-                    for span in line["spans"]:
-                        text = span.get("text", "")
-                        if not text.strip():
-                            continue
-                        
+                    # A malformed span loses its formatting but keeps its text
+                    try:
                         # Get font information
                         font_flags = span.get("flags", 0)
-                        font_name = span.get("font", "").lower()
+                        font_name = span.get("font", "")
+                        font_lc = font_lc_cache.get(font_name)
+                        if font_lc is None:
+                            font_lc = font_lc_cache[font_name] = font_name.lower()
                         
                         # Determine formatting
-                        is_bold = bool(font_flags & 2**4) or "bold" in font_name
-                        is_italic = bool(font_flags & 2**1) or "italic" in font_name or "oblique" in font_name
-                        
-                        # Apply markdown formatting
-                        formatted_span = text
-                        if is_bold and is_italic:
-                            formatted_span = f"***{text}***"
-                        elif is_bold:
-                            formatted_span = f"**{text}**"
-                        elif is_italic:
-                            formatted_span = f"*{text}*"
-                        
-                        line_text += formatted_span
+                        is_bold = (font_flags & _BOLD_FLAG) != 0 or "bold" in font_lc
+                        is_italic = (font_flags & _ITALIC_FLAG) != 0 or "italic" in font_lc or "oblique" in font_lc
+                    except (KeyError, TypeError, AttributeError) as e:
+                        print(f"⚠️ Skipping formatting for malformed span: {e}")
+                        is_bold = is_italic = False
                     
-                    if line_text.strip():
-                        block_text += line_text + "\n"
+                    # Apply markdown formatting
+                    formatted_span = text
+                    if is_bold and is_italic:
+                        formatted_span = f"***{text}***"
+                    elif is_bold:
+                        formatted_span = f"**{text}**"
+                    elif is_italic:
+                        formatted_span = f"*{text}*"
+                    
+                    line_parts.append(formatted_span)
                 
-                if block_text.strip():
-                    formatted_text += block_text + "\n"
-        
-        except Exception as e:
-            print(f"⚠️ Error extracting formatting, using plain text: {e}")
-            # Fallback to plain text extraction
-            try:
-                for block in text_dict.get("blocks", []):
-                    if "lines" not in block:
-                        continue
-                    for line in block["lines"]:
-                        for span in line["spans"]:
-                            text = span.get("text", "")
-                            if text.strip():
-                                formatted_text += text
-                        formatted_text += "\n"
-                    formatted_text += "\n"
-            except:
-                formatted_text = "Error extracting text content"
+                if line_parts:
+                    block_parts.append("".join(line_parts))
+                    block_parts.append("\n")
+            
+            if block_parts:
+                out.extend(block_parts)
+                out.append("\n")
         
-        return formatted_text
+        return "".join(out)
     
-    def export_to_pdf(self, rich_text_widget, default_filename=None, dialog_title="Export Medical Report"):
-        """Export rich text widget content to PDF"""
+    def export_to_pdf(self, rich_text_widget, default_filename=None, dialog_title="Export Medical Report", on_complete=None):
+        """Export rich text widget content to PDF
+        
+        The save dialog and content snapshot run on the UI thread; the PDF is
+        rendered on the file worker and the final result dict is delivered to
+        on_complete on the UI thread. The returned dict has 'pending' set while
+        rendering is still in progress.
+        """
         try:
             # Check if there's content to export
             report_content = rich_text_widget.get_text()
@@ -174,24 +266,32 @@ class FileOperationsManager:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 default_filename = f"MedReport_{timestamp}.pdf"
             
-            print(f"📄 Starting PDF export with filename: {default_filename}")
+            _dbg(f"📄 Starting PDF export with filename: {default_filename}")
             
-            # Use the rich text PDF generator
-            result = rich_text_to_pdf_with_dialog(
-                rich_text_widget=rich_text_widget,
-                default_filename=default_filename,
-                dialog_title=dialog_title,
-                auto_open=True
-            )
+            # Get save path from user
+            output_path = get_save_path(default_filename, None, dialog_title, parent=self.root)
+            if not output_path:
+                _dbg("ℹ️ Export cancelled by user")
+                return {
+                    'success': False,
+                    'file_path': None,
+                    'cancelled': True,
+                    'message': 'Cancelled by user'
+                }
+            
+            # Snapshot widget content here: Tk objects must not be touched from the worker
+            raw_markdown = rich_text_widget.get_raw_markdown()
             
-            if result['success']:
-                print(f"✅ {result['message']}")
-            elif result['cancelled']:
-                print("ℹ️ Export cancelled by user")
-            else:
-                print(f"❌ {result['message']}")
+            future = self._executor.submit(write_pdf_document, raw_markdown, report_content, output_path, True)
+            future.add_done_callback(lambda fut: rich_text_widget.after(0, self._finish_export, fut, on_complete))
             
-            return result
+            return {
+                'success': True,
+                'pending': True,
+                'file_path': output_path,
+                'cancelled': False,
+                'message': f'Export started: {output_path}'
+            }
                 
         except Exception as e:
             error_msg = f"Export failed: {str(e)}"
@@ -203,6 +303,26 @@ class FileOperationsManager:
                 'message': error_msg
             }
     
+    def _finish_export(self, future, on_complete):
+        """Report a finished background export (UI thread)"""
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {
+                'success': False,
+                'file_path': None,
+                'cancelled': False,
+                'message': f"Export failed: {str(e)}"
+            }
+        
+        if result['success']:
+            _dbg(f"✅ {result['message']}")
+        else:
+            print(f"❌ {result['message']}")
+        
+        if on_complete:
+            on_complete(result)
+    
     def get_imported_content(self):
         """Get the current imported document content"""
         return self.imported_document_content
@@ -210,12 +330,12 @@ class FileOperationsManager:
     def clear_imported_content(self):
         """Clear the imported document content"""
         self.imported_document_content = ""
-        print("🧹 Cleared imported document content")
+        _dbg("🧹 Cleared imported document content")
     
     def reset_imported_content(self):
         """Reset imported content (alias for clear)"""
         self.clear_imported_content()
-        print("🔄 Reset imported document content")
+        _dbg("🔄 Reset imported document content")
     
     def has_imported_content(self):
         """Check if there's imported content"""
@@ -224,22 +344,22 @@ class FileOperationsManager:
     def load_custom_report_format(self, custom_file="custom_report_format.txt"):
         """Load custom report format from file"""
         try:
-            if os.path.exists(custom_file):
-                with open(custom_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content:
-                        success_msg = f"Custom report format loaded: {len(content)} characters"
-                        print(f"✅ {success_msg}")
-                        return True, content, success_msg
-                    else:
-                        error_msg = "Custom report format file is empty"
-                        print(f"⚠️ {error_msg}")
-                        return False, "", error_msg
-            else:
-                error_msg = "Custom report format file not found"
-                print(f"ℹ️ {error_msg}")
-                return False, "", error_msg
+            with open(custom_file, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+        except FileNotFoundError:
+            error_msg = "Custom report format file not found"
+            _dbg(f"ℹ️ {error_msg}")
+            return False, "", error_msg
         except Exception as e:
             error_msg = f"Error loading custom report format: {str(e)}"
             print(f"❌ {error_msg}")
-            return False, "", error_msg
\ No newline at end of file
+            return False, "", error_msg
+        
+        if not content:
+            error_msg = "Custom report format file is empty"
+            print(f"⚠️ {error_msg}")
+            return False, "", error_msg
+        
+        success_msg = f"Custom report format loaded: {len(content)} characters"
+        _dbg(f"✅ {success_msg}")
+        return True, content, success_msg
\ No newline at end of file
@@ -4,8 +4,11 @@
 # ============================================================================
 
 import tkinter as tk
+import collections
+import logging
 import signal
 import sys
+import threading
 from audio import AudioEngine
 from ui import UIManager
 from config import *
@@ -19,6 +22,16 @@ class App:
         # Create main window
         self.root = tk.Tk()
         
+        # Updates posted from worker threads, drained in one idle flush
+        self._pending = collections.deque()
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
+        
+        # Transcription text from the audio thread: single producer, single consumer,
+        # deque append/popleft are atomic so no lock or per-chunk Tk job is needed
+        self._trans_ring = collections.deque(maxlen=TRANSCRIPTION_RING_SIZE)
+        self._drain_armed = False
+        
         # Setup graceful shutdown handling
         self.setup_shutdown_handlers()
         
@@ -54,30 +67,81 @@ class App:
     
     def setup_callbacks(self):
         """Setup callback connections between components"""
-        # Update UI callbacks to use UI manager methods
-        self.ui_callbacks['update_status'] = self.ui_manager.update_status
-        self.ui_callbacks['append_transcription'] = self.ui_manager.append_transcription
-        self.ui_callbacks['schedule_ui_update'] = self.ui_manager.schedule_ui_update
+        # The coalescing wrappers stay in place: on the UI thread they call the
+        # UI manager directly, from worker threads they queue for one idle flush
+        self.ui_callbacks['update_status'] = self.update_status_callback
+        self.ui_callbacks['append_transcription'] = self.append_transcription_callback
+        self.ui_callbacks['schedule_ui_update'] = self.schedule_ui_update_callback
         
         print("🔗 Callbacks connected successfully")
     
     def update_status_callback(self, message, color, animation_type):
         """Thread-safe callback wrapper for status updates"""
-        def update():
+        if threading.current_thread() is threading.main_thread():
             self.ui_manager.update_status(message, color, animation_type)
-        
-        self.root.after(0, update)
+        else:
+            self._post(('status', message, color, animation_type))
     
     def append_transcription_callback(self, text):
         """Thread-safe callback wrapper for transcription updates"""
-        def update():
+        if threading.current_thread() is threading.main_thread():
             self.ui_manager.append_transcription(text)
-        
-        self.root.after(0, update)
+        else:
+            self._trans_ring.append(text)
+            # Append before checking the flag: a drain that already cleared it will see this text
+            if not self._drain_armed:
+                self._drain_armed = True
+                self.root.after(TRANSCRIPTION_DRAIN_MS, self._drain_trans_ring)
     
     def schedule_ui_update_callback(self, callback):
         """Thread-safe UI update scheduling"""
-        self.root.after(0, callback)
+        self._post(('call', callback))
+    
+    def _post(self, item):
+        """Queue an update and make sure one idle flush is pending"""
+        with self._pending_lock:
+            self._pending.append(item)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self.root.after_idle(self._flush_pending)
+    
+    def _drain_trans_ring(self):
+        """Append all transcription text queued since the drain was armed"""
+        self._drain_armed = False
+        ring = self._trans_ring
+        chunks = []
+        while ring:
+            text = ring.popleft()
+            if text and text.strip():
+                chunks.append(text)
+        
+        if chunks:
+            try:
+                # append_transcription adds the trailing newline itself
+                self.ui_manager.append_transcription('\n'.join(chunks))
+            except Exception as e:
+                print(f"⚠️ UI update failed: {e}")
+    
+    def _flush_pending(self):
+        """Apply every queued update, keeping only the last of consecutive status updates"""
+        with self._pending_lock:
+            items = list(self._pending)
+            self._pending.clear()
+            self._flush_scheduled = False
+        
+        for i, item in enumerate(items):
+            kind = item[0]
+            try:
+                if kind == 'status':
+                    # Only the last of consecutive status updates is visible anyway
+                    next_kind = items[i + 1][0] if i + 1 < len(items) else None
+                    if next_kind != 'status':
+                        self.ui_manager.update_status(*item[1:])
+                else:
+                    item[1]()
+            except Exception as e:
+                print(f"⚠️ UI update failed: {e}")
     
     def on_window_close(self):
         """Handle window close event gracefully"""
@@ -133,6 +197,8 @@ class App:
 
 def main():
     """Application entry point"""
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    
     try:
         print(f"🎯 Starting {APP_TITLE} v{APP_VERSION}")
         print("=" * 60)
@@ -3,22 +3,39 @@
 # PDF Generator that uses raw markdown from RichTextWidget
 # ============================================================================
 
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.units import inch
-from reportlab.lib.colors import black, blue, red, green
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
-from tkinter import filedialog
-import tkinter as tk
+# ReportLab, the file dialog and process helpers are imported inside the functions
+# that use them, so app startup does not pay for them until a PDF is exported
 import os
-import subprocess
-import platform
 import re
+import functools
 from datetime import datetime
 
+# Inline markdown -> ReportLab XML: the bold family is matched before italics (as the
+# chained passes did) so *a **b** c* nests; each family is one alternation, most specific first
+_RE_BOLD_MARKDOWN = re.compile(r'\*\*\*(?P<bi>.+?)\*\*\*|___(?P<bu>.+?)___|\*\*(?P<b>.+?)\*\*|__(?P<u>.+?)__')
+_RE_ITALIC_MARKDOWN = re.compile(r'_(?P<i1>.+?)_|\*(?P<i2>.+?)\*')
+_MARKDOWN_TAGS = {
+    'bi': ('<b><i>', '</i></b>'),   # ***bold italic***
+    'bu': ('<b><u>', '</u></b>'),   # ___bold underline___
+    'b': ('<b>', '</b>'),           # **bold**
+    'u': ('<u>', '</u>'),           # __underline__
+    'i1': ('<i>', '</i>'),          # _italic_
+    'i2': ('<i>', '</i>'),          # *italic*
+}
+_XML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+_RE_TAG = re.compile(r'<[^>]*>')
+
+# Header prefixes (most specific first) and the paragraph style each maps to
+_HEADER_STYLES = (('### ', 'SectionHeader'), ('## ', 'SectionHeader'), ('# ', 'MainHeader'))
+
+# Space left after each kind of block
+_BLOCK_SPACING = {'MainHeader': 8, 'SectionHeader': 6, 'MedicalBody': 4}
+_BLANK_LINE_SPACING = 6
+
 def open_pdf(file_path):
+    import platform
+    import subprocess
+    
     try:
         if platform.system() == 'Darwin':  # macOS
             subprocess.call(('open', file_path))
@@ -31,8 +48,16 @@ def open_pdf(file_path):
         print(f"Could not open PDF automatically: {e}")
         return False
 
+@functools.lru_cache(maxsize=1)
 def create_medical_styles():
-    """Create professional medical report styles with enhanced design"""
+    """Create professional medical report styles with enhanced design
+    
+    Built once and shared by every export; Paragraph only reads its style.
+    """
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.colors import black
+    from reportlab.lib.enums import TA_LEFT, TA_CENTER
+    
     styles = getSampleStyleSheet()
     
     # Enhanced Document title with better design
@@ -105,45 +130,60 @@ def create_medical_styles():
     
     return styles
 
-def convert_markdown_to_reportlab(markdown_text):
-    """Convert markdown text to ReportLab-compatible XML"""
+def _markdown_to_xml(match):
+    """Replace one markdown construct, formatting same-family markdown nested in it"""
+    kind = match.lastgroup
+    open_tag, close_tag = _MARKDOWN_TAGS[kind]
+    return open_tag + match.re.sub(_markdown_to_xml, match.group(kind)) + close_tag
+
+def format_inline_markdown(text):
+    """Convert bold/underline/italic markers in already escaped text to ReportLab XML"""
+    return _RE_ITALIC_MARKDOWN.sub(_markdown_to_xml, _RE_BOLD_MARKDOWN.sub(_markdown_to_xml, text))
+
+def parse_markdown_to_blocks(markdown_text):
+    """Convert markdown text to (style_name, ReportLab XML) blocks
+    
+    Paragraphs are separated by blank lines; a whitespace-only line inside a
+    paragraph becomes a ('Spacer', None) block.
+    """
     print(f"🔧 Converting markdown to ReportLab format...")
     print(f"📝 Input length: {len(markdown_text)} characters")
     
-    # Start with the original text
-    xml_text = markdown_text
-    
-    # Escape XML characters first (but preserve our formatting)
-    xml_text = xml_text.replace('&', '&amp;')
-    xml_text = xml_text.replace('<', '&lt;')
-    xml_text = xml_text.replace('>', '&gt;')
+    blocks = []
+    blocks_append = blocks.append
     
-    # Convert markdown headers (most specific first)
-    xml_text = re.sub(r'^### (.+)$', r'<para style="SectionHeader">\1</para>', xml_text, flags=re.MULTILINE)
-    xml_text = re.sub(r'^## (.+)$', r'<para style="SectionHeader">\1</para>', xml_text, flags=re.MULTILINE)
-    xml_text = re.sub(r'^# (.+)$', r'<para style="MainHeader">\1</para>', xml_text, flags=re.MULTILINE)
-    
-    # Convert inline formatting (order is important!)
-    # Bold + italic combination first
-    xml_text = re.sub(r'\*\*\*(.+?)\*\*\*', r'<b><i>\1</i></b>', xml_text)
-    
-    # Bold + underline combination
-    xml_text = re.sub(r'___(.+?)___', r'<b><u>\1</u></b>', xml_text)
-    
-    # Individual formatting
-    xml_text = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', xml_text)  # **bold**
-    xml_text = re.sub(r'__(.+?)__', r'<u>\1</u>', xml_text)      # __underline__
-    xml_text = re.sub(r'_(.+?)_', r'<i>\1</i>', xml_text)        # _italic_
-    xml_text = re.sub(r'\*(.+?)\*', r'<i>\1</i>', xml_text)      # *italic*
-    
-    print(f"✅ Conversion complete")
-    print(f"🎨 Output preview: {xml_text[:200]}..." if len(xml_text) > 200 else f"🎨 Output: {xml_text}")
+    # Escape XML characters first (but preserve our formatting): one C-level scan of the whole text
+    for para_text in markdown_text.translate(_XML_ESCAPE).split('\n\n'):
+        lines = para_text.split('\n')
+        
+        # Blank lines at either end of a paragraph are dropped, not turned into spacers
+        start, end = 0, len(lines)
+        while start < end and not lines[start].strip():
+            start += 1
+        while end > start and not lines[end - 1].strip():
+            end -= 1
+        
+        for line in lines[start:end]:
+            for prefix, header_style in _HEADER_STYLES:
+                if line.startswith(prefix) and len(line) > len(prefix):
+                    blocks_append((header_style, format_inline_markdown(line[len(prefix):])))
+                    break
+            else:
+                line = line.strip()
+                if line:
+                    blocks_append(('MedicalBody', format_inline_markdown(line)))
+                else:
+                    blocks_append(('Spacer', None))
     
-    return xml_text
+    print(f"✅ Conversion complete: {len(blocks)} blocks")
+    return blocks
 
 def create_pdf_from_markdown(markdown_text, output_filename):
     """Create professional PDF from markdown text"""
     try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate
+        
         print(f"📄 Creating PDF from markdown...")
         
         # Create document with professional margins
@@ -160,11 +200,11 @@ def create_pdf_from_markdown(markdown_text, output_filename):
         styles = create_medical_styles()
         story = []
         
-        # Convert markdown to XML
-        xml_content = convert_markdown_to_reportlab(markdown_text)
+        # Convert markdown to styled blocks
+        blocks = parse_markdown_to_blocks(markdown_text)
         
         # Process the content
-        process_content_to_story(xml_content, story, styles)
+        process_content_to_story(blocks, story, styles)
         
         # Build the PDF
         doc.build(story)
@@ -177,56 +217,36 @@ def create_pdf_from_markdown(markdown_text, output_filename):
         traceback.print_exc()
         return False
 
-def process_content_to_story(xml_content, story, styles):
-    """Process XML content and add to story"""
+def process_content_to_story(blocks, story, styles):
+    """Turn (style_name, content) blocks into flowables and add them to story"""
+    from reportlab.platypus import Paragraph, Spacer
     
-    # Split into paragraphs
-    paragraphs = xml_content.split('\n\n')
+    story_append = story.append
+    block_styles = {name: styles[name] for name in _BLOCK_SPACING}
     
-    for para_text in paragraphs:
-        para_text = para_text.strip()
-        if not para_text:
+    for style_name, content in blocks:
+        if content is None:
+            story_append(Spacer(1, _BLANK_LINE_SPACING))
             continue
         
-        # Split into lines
-        lines = para_text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                story.append(Spacer(1, 6))
-                continue
+        try:
+            story_append(Paragraph(content, block_styles[style_name]))
+            story_append(Spacer(1, _BLOCK_SPACING[style_name]))
             
-            try:
-                # Check for special paragraph styles
-                if '<para style="MainHeader">' in line:
-                    # Extract content from header tag
-                    content = re.sub(r'<para style="MainHeader">(.+?)</para>', r'\1', line)
-                    story.append(Paragraph(content, styles['MainHeader']))
-                    story.append(Spacer(1, 8))
-                    
-                elif '<para style="SectionHeader">' in line:
-                    # Extract content from section header tag
-                    content = re.sub(r'<para style="SectionHeader">(.+?)</para>', r'\1', line)
-                    story.append(Paragraph(content, styles['SectionHeader']))
-                    story.append(Spacer(1, 6))
-                    
-                else:
-                    # Regular paragraph with inline formatting
-                    story.append(Paragraph(line, styles['MedicalBody']))
-                    story.append(Spacer(1, 4))
-                    
-            except Exception as e:
-                print(f"⚠️ Error processing line: {e}")
-                # Fallback: remove all XML tags and use plain text
-                plain_line = re.sub(r'<[^>]*>', '', line)
-                if plain_line.strip():
-                    story.append(Paragraph(plain_line, styles['MedicalBody']))
-                    story.append(Spacer(1, 4))
+        except Exception as e:
+            print(f"⚠️ Error processing line: {e}")
+            # Fallback: remove all XML tags and use plain text
+            plain_line = _RE_TAG.sub('', content)
+            if plain_line.strip():
+                story_append(Paragraph(plain_line, styles['MedicalBody']))
+                story_append(Spacer(1, 4))
 
 def create_simple_pdf(plain_text, output_filename):
     """Create basic PDF from plain text"""
     try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+        
         print(f"📄 Creating PDF from plain text...")
         
         doc = SimpleDocTemplate(output_filename, pagesize=A4)
@@ -267,9 +287,18 @@ def generate_default_filename(prefix="Medical_report"):
     current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
     return f"{prefix}_{current_time}.pdf"
 
-def get_save_path(default_filename=None, initial_dir=None, title="Save PDF as..."):
-    root = tk.Tk()
-    root.withdraw()
+def get_save_path(default_filename=None, initial_dir=None, title="Save PDF as...", parent=None):
+    """Ask for the PDF destination, parented to the app window when one is given
+    
+    Without a parent a throwaway hidden Tk root is created for the dialog.
+    """
+    import tkinter as tk
+    from tkinter import filedialog
+    
+    root = None
+    if parent is None:
+        root = tk.Tk()
+        root.withdraw()
     
     if initial_dir is None:
         initial_dir = os.getcwd()
@@ -282,25 +311,28 @@ def get_save_path(default_filename=None, initial_dir=None, title="Save PDF as...
             initialfile=default_filename,
             defaultextension=".pdf",
             filetypes=[("Fichiers PDF", "*.pdf"), ("Tous les fichiers", "*.*")],
-            title=title
+            title=title,
+            parent=parent if parent is not None else root
         )
         return output_path if output_path else None
     finally:
-        root.destroy()
+        if root is not None:
+            root.destroy()
 
 # Export function
 def rich_text_to_pdf_with_dialog(rich_text_widget, 
                                 default_filename=None, 
                                 initial_dir=None, 
                                 auto_open=True,
-                                dialog_title="Save the medical report as..."):
+                                dialog_title="Save the medical report as...",
+                                parent=None):
     """Export rich text widget to PDF with formatting preserved"""
     
     if default_filename is None:
         default_filename = generate_default_filename()
     
     # Get save path from user
-    output_path = get_save_path(default_filename, initial_dir, dialog_title)
+    output_path = get_save_path(default_filename, initial_dir, dialog_title, parent)
     
     if not output_path:
         return {
@@ -310,26 +342,27 @@ def rich_text_to_pdf_with_dialog(rich_text_widget,
             'message': 'Cancelled by user'
         }
     
-    print(f"📄 Starting PDF export to: {output_path}")
-    
     # Get the raw markdown text from the widget
     try:
         raw_markdown = rich_text_widget.get_raw_markdown()
-        print(f"💾 Retrieved raw markdown: {len(raw_markdown)} characters")
-        print(f"📝 Markdown preview: {raw_markdown[:100]}...")
-        
-        if raw_markdown and raw_markdown.strip():
-            # Use the raw markdown with formatting tags
-            pdf_created = create_pdf_from_markdown(raw_markdown, output_path)
-        else:
-            print("⚠️ No raw markdown available, using display text")
-            display_text = rich_text_widget.get_text()
-            pdf_created = create_simple_pdf(display_text, output_path)
-            
     except AttributeError as e:
         print(f"⚠️ Widget doesn't support get_raw_markdown(): {e}")
-        # Fallback to display text
-        display_text = rich_text_widget.get_text()
+        raw_markdown = ""
+    display_text = rich_text_widget.get_text()
+    
+    return write_pdf_document(raw_markdown, display_text, output_path, auto_open)
+
+def write_pdf_document(raw_markdown, display_text, output_path, auto_open=True):
+    """Render already-extracted report text to a PDF file (safe off the UI thread)"""
+    print(f"📄 Starting PDF export to: {output_path}")
+    print(f"💾 Retrieved raw markdown: {len(raw_markdown)} characters")
+    print(f"📝 Markdown preview: {raw_markdown[:100]}...")
+    
+    if raw_markdown and raw_markdown.strip():
+        # Use the raw markdown with formatting tags
+        pdf_created = create_pdf_from_markdown(raw_markdown, output_path)
+    else:
+        print("⚠️ No raw markdown available, using display text")
         pdf_created = create_simple_pdf(display_text, output_path)
     
     if not pdf_created:
@@ -84,13 +84,18 @@ class RichTextWidget:
     def insert_formatted_text(self, raw_markdown_text, clear_first=True):
         """Insert text with markdown formatting - stores raw and displays formatted"""
         
-        # STEP 1: Store the raw markdown text (with ** and * tags)
-        self._raw_markdown_text = raw_markdown_text
-        print(f"💾 Stored raw markdown: {len(raw_markdown_text)} chars")
+        # STEP 1: Store the raw markdown text (with ** and * tags), appending when not clearing
+        display_text = self._remove_markdown_tags(raw_markdown_text)
+        if clear_first:
+            self._raw_markdown_text = raw_markdown_text
+            self._formatted_display_text = display_text
+        else:
+            self._raw_markdown_text += raw_markdown_text
+            self._formatted_display_text += display_text
+        print(f"💾 Stored raw markdown: {len(self._raw_markdown_text)} chars")
         print(f"📝 Raw preview: {raw_markdown_text[:100]}...")
         
         # STEP 2: Convert markdown to clean display text and apply formatting
-        self._formatted_display_text = self._remove_markdown_tags(raw_markdown_text)
         print(f"🎨 Created display text: {len(self._formatted_display_text)} chars")
         print(f"👁️ Display preview: {self._formatted_display_text[:100]}...")
         
@@ -285,4 +290,7 @@ class RichTextWidget:
         return self.widget.bind(sequence, func)
     
     def see(self, index):
-        return self.widget.see(index)
\ No newline at end of file
+        return self.widget.see(index)
+    
+    def after(self, ms, func=None, *args):
+        return self.widget.after(ms, func, *args)
\ No newline at end of file
@@ -0,0 +1,87 @@
+# test_pdf_generator.py
+# ============================================================================
+# Markdown -> ReportLab XML conversion tests (run: python -m unittest discover tests)
+# ============================================================================
+
+import os
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_generator import format_inline_markdown, parse_markdown_to_blocks
+
+def chained_inline_markdown(text):
+    """The original one-pass-per-marker conversion, used as the reference"""
+    text = re.sub(r'\*\*\*(.+?)\*\*\*', r'<b><i>\1</i></b>', text)
+    text = re.sub(r'___(.+?)___', r'<b><u>\1</u></b>', text)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', text)
+    text = re.sub(r'__(.+?)__', r'<u>\1</u>', text)
+    text = re.sub(r'_(.+?)_', r'<i>\1</i>', text)
+    text = re.sub(r'\*(.+?)\*', r'<i>\1</i>', text)
+    return text
+
+def reference_blocks(markdown_text):
+    """The original XML round trip (headers, paragraph split, tag extraction) as blocks"""
+    xml = markdown_text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    xml = re.sub(r'^### (.+)$', r'<para style="SectionHeader">\1</para>', xml, flags=re.MULTILINE)
+    xml = re.sub(r'^## (.+)$', r'<para style="SectionHeader">\1</para>', xml, flags=re.MULTILINE)
+    xml = re.sub(r'^# (.+)$', r'<para style="MainHeader">\1</para>', xml, flags=re.MULTILINE)
+    xml = chained_inline_markdown(xml)
+    
+    blocks = []
+    for para_text in xml.split('\n\n'):
+        para_text = para_text.strip()
+        if not para_text:
+            continue
+        for line in para_text.split('\n'):
+            line = line.strip()
+            if not line:
+                blocks.append(('Spacer', None))
+            elif '<para style="MainHeader">' in line:
+                blocks.append(('MainHeader', re.sub(r'<para style="MainHeader">(.+?)</para>', r'\1', line)))
+            elif '<para style="SectionHeader">' in line:
+                blocks.append(('SectionHeader', re.sub(r'<para style="SectionHeader">(.+?)</para>', r'\1', line)))
+            else:
+                blocks.append(('MedicalBody', line))
+    return blocks
+
+class InlineMarkdownTest(unittest.TestCase):
+    
+    def test_nested_markers(self):
+        self.assertEqual(format_inline_markdown("*a **b** c*"), "<i>a <b>b</b> c</i>")
+        self.assertEqual(format_inline_markdown("**a *b* c**"), "<b>a <i>b</i> c</b>")
+        self.assertEqual(format_inline_markdown("_a __b__ c_"), "<i>a <u>b</u> c</i>")
+        self.assertEqual(format_inline_markdown("*a _b_ c*"), "<i>a <i>b</i> c</i>")
+    
+    def test_matches_chained_passes(self):
+        samples = [
+            "Patient has **chest pain** and *mild* fever",
+            "***Urgent*** ___note___ __u__ _i_",
+            "*a **b** c* and **d *e* f**",
+            "__a *b* c__ then ___x **y** z___",
+            "**unclosed *markers_ here",
+            "snake_case_name and 2 * 3 * 4",
+        ]
+        for sample in samples:
+            with self.subTest(sample=sample):
+                self.assertEqual(format_inline_markdown(sample), chained_inline_markdown(sample))
+
+class MarkdownBlocksTest(unittest.TestCase):
+    
+    def test_matches_original_layout(self):
+        samples = [
+            "# Report\n## **Findings** & notes\n\n\n### Sub _x_\nPatient <38>\n",
+            "First paragraph\nsecond line\n\nNext paragraph",
+            "a\n \nb\n\n \n\nc\n \n\nd",
+            "  # not a header\n#\n# \n#### deep\n# Title  ",
+            "line one\r\n\r\nline two\r\n# Header\r\n",
+            "\n\n\nleading blank lines\n\n\n\n",
+        ]
+        for sample in samples:
+            with self.subTest(sample=sample):
+                self.assertEqual(parse_markdown_to_blocks(sample), reference_blocks(sample))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,6 +17,7 @@ from file_operations import FileOperationsManager
 from audio_manager import AudioUIManager
 from animation_manager import AnimationManager
 from prescription_manager import PrescriptionManager
+from asyncio_integration import schedule_asyncio, stop_asyncio
 
 class UIManager:
     def __init__(self, root, audio_engine):
@@ -25,8 +26,11 @@ class UIManager:
         self.current_transcription = ""
         self.is_generating_report = False
         
+        # asyncio loop pumped from the Tk main loop (drives the chronometer task)
+        self.asyncio_loop = schedule_asyncio(root)
+        
         # Initialize managers
-        self.file_manager = FileOperationsManager()
+        self.file_manager = FileOperationsManager(root)
         self.audio_ui_manager = AudioUIManager(audio_engine, self)
         self.animation_manager = AnimationManager(root, audio_engine)
         self.prescription_manager = None  # Will be initialized when analysis section is created
@@ -663,14 +667,17 @@ class UIManager:
     
     def import_document(self):
         """Import a PDF document using FileOperationsManager"""
-        success, content, message = self.file_manager.import_pdf_document(self.summary_text)
+        def on_import_complete(success, content, message):
+            if success:
+                print(f"✅ Document imported: {message}")
+                # Reset prescription status when importing new document
+                if self.prescription_manager:
+                    self.prescription_manager.reset_prescription_status()
+            else:
+                print(f"❌ Import failed: {message}")
         
-        if success:
-            print(f"✅ Document imported: {message}")
-            # Reset prescription status when importing new document
-            if self.prescription_manager:
-                self.prescription_manager.reset_prescription_status()
-        else:
+        success, content, message = self.file_manager.import_pdf_document(self.summary_text, on_import_complete)
+        if not success:
             print(f"❌ Import failed: {message}")
     
     def clear_transcription(self):
@@ -697,8 +704,8 @@ class UIManager:
             self.prescription_manager.reset_prescription_status()
         
         # Clear audio engine transcripts
-        if hasattr(self.audio_engine, 'chunk_transcripts'):
-            self.audio_engine.chunk_transcripts = []
+        if hasattr(self.audio_engine, 'clear_transcripts'):
+            self.audio_engine.clear_transcripts()
             print("🧹 Cleared chunk transcripts")
         
         # Reset chronometer
@@ -981,18 +988,23 @@ class UIManager:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             default_filename = f"{APP_TITLE}_{timestamp}.pdf"
             
-            # Use the file manager for export
+            def on_export_complete(result):
+                if result['success']:
+                    print(f"✅ {result['message']}")
+                else:
+                    print(f"❌ {result['message']}")
+            
+            # Use the file manager for export (rendering continues in the background)
             result = self.file_manager.export_to_pdf(
                 rich_text_widget=self.summary_text,
                 default_filename=default_filename,
-                dialog_title="Export Medical Report"
+                dialog_title="Export Medical Report",
+                on_complete=on_export_complete
             )
             
-            if result['success']:
-                print(f"✅ {result['message']}")
-            elif result['cancelled']:
+            if result['cancelled']:
                 print("ℹ️ Export cancelled by user")
-            else:
+            elif not result['success']:
                 print(f"❌ {result['message']}")
                 
         except Exception as e:
@@ -1117,6 +1129,8 @@ class UIManager:
             if hasattr(self, 'prescription_manager'):
                 self.prescription_manager.cleanup()
             
+            stop_asyncio(getattr(self, 'asyncio_loop', None))
+            
             print("✅ UI cleanup completed")
             
         except Exception as e: